@@ -250,7 +250,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
     1. Firebase ID Token (Google Login)
     2. Custom JWT (Email/Password Login)
     """
-    from src.auth.firebase_auth import verify_firebase_token
+    from src.auth.firebase_auth import averify_firebase_token
     from jose import jwt, JWTError
     from src.auth.security import SECRET_KEY, ALGORITHM
     
@@ -264,9 +264,8 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
     
     # 1. Try verifying as Firebase Token first
     try:
-        # Verify Firebase token directly (run in thread to prevent blocking)
-        # We suppress print output here to avoid spamming logs on fallback
-        decoded_token = await asyncio.to_thread(verify_firebase_token, token, clock_skew_seconds=10)
+        # Verify Firebase token (cached tokens skip the worker thread)
+        decoded_token = await averify_firebase_token(token, clock_skew_seconds=10)
         
         if decoded_token:
             firebase_uid = decoded_token.get("uid")
@@ -620,10 +619,10 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), request: Reque
 async def firebase_login(request_data: FirebaseLoginRequest, request: Request):
     """Google OAuth login via Firebase"""
     try:
-        from src.auth.firebase_auth import verify_firebase_token
+        from src.auth.firebase_auth import averify_firebase_token
         
-        # Verify Firebase token with 10 seconds clock skew tolerance (run in thread)
-        decoded_token = await asyncio.to_thread(verify_firebase_token, request_data.id_token, clock_skew_seconds=10)
+        # Verify Firebase token with 10 seconds clock skew tolerance
+        decoded_token = await averify_firebase_token(request_data.id_token, clock_skew_seconds=10)
         if not decoded_token:
             logger.error("❌ Firebase token verification failed")
             logger.error(f"   Token starts with: {request_data.id_token[:50]}...")
@@ -826,8 +825,7 @@ async def update_user_profile(
         
         if profile_data.address:
             # Convert address to JSON string, then encrypt
-            import json
-            address_json = json.dumps(profile_data.address.dict())
+            address_json = profile_data.address.model_dump_json()
             encrypted_address = encryption_manager.encrypt(address_json, user_salt)
             update_fields["address_encrypted"] = encrypted_address
             logger.info(f"✅ Encrypted address")
@@ -2641,7 +2639,7 @@ async def extract_prescription_image(
         # Extract data using OpenAI Vision (global extractor)
         try:
             logger.info("Calling OpenAI Vision API for extraction...")
-            extracted_data = image_extractor.extract_prescription_data(str(temp_path))
+            extracted_data = await image_extractor.aextract_prescription_data(str(temp_path))
             logger.info(f"Extraction result: {extracted_data is not None}")
         except Exception as extract_err:
             logger.error(f"Extraction API error: {extract_err}", exc_info=True)
@@ -2751,7 +2749,7 @@ async def extract_discharge_image(
         
         # Extract data
         extractor = ImageDocumentExtractor()
-        extracted_data = extractor.extract_discharge_summary(str(temp_path))
+        extracted_data = await extractor.aextract_discharge_summary(str(temp_path))
         
         # Handle PDF text extraction
         if extracted_data and "_pdf_text" in extracted_data:
@@ -2863,7 +2861,7 @@ async def extract_lab_report_image(
         
         # Extract
         extractor = ImageDocumentExtractor()
-        extracted_data = extractor.extract_lab_report(str(temp_path))
+        extracted_data = await extractor.aextract_lab_report(str(temp_path))
         
         if not extracted_data:
             raise HTTPException(status_code=500, detail="Failed to extract lab report data")
@@ -2917,10 +2915,10 @@ async def check_otc_medication(
     Uses vector search + LLM verification for accurate results.
     """
     try:
-        from src.utils.otc_medication_checker import OTCMedicationChecker
+        from src.utils.otc_medication_checker import get_otc_checker
         
-        checker = OTCMedicationChecker()
-        result = checker.check_medication(request.medication, request.dosage)
+        checker = get_otc_checker()
+        result = await checker.acheck_medication(request.medication, request.dosage)
         
         # Log the check
         await mongodb_manager.db.otc_checks.insert_one({
@@ -2947,10 +2945,10 @@ async def check_otc_medications_batch(
     Check multiple medications at once for OTC availability.
     """
     try:
-        from src.utils.otc_medication_checker import OTCMedicationChecker
+        from src.utils.otc_medication_checker import get_otc_checker
         
-        checker = OTCMedicationChecker()
-        results = checker.check_medications_batch(request.medications)
+        checker = get_otc_checker()
+        results = await checker.acheck_medications_batch(request.medications)
         
         # Log batch check
         await mongodb_manager.db.otc_checks.insert_one({
@@ -2974,7 +2972,7 @@ async def get_otc_medication_list():
     Get the complete list of approved OTC medications (public endpoint).
     """
     try:
-        from src.utils.otc_medication_checker import APPROVED_OTC_MEDICATIONS
+        from src.utils.otc_lookup import APPROVED_OTC_MEDICATIONS
         
         return {
             "count": len(APPROVED_OTC_MEDICATIONS),
@@ -3002,7 +3000,7 @@ async def analyze_prescription_complete(
     """
     try:
         from src.document_processor.image_extractor import ImageDocumentExtractor
-        from src.utils.otc_medication_checker import OTCMedicationChecker
+        from src.utils.otc_medication_checker import get_otc_checker
         
         # Step 1: Extract prescription
         upload_dir = Path("uploads/prescriptions")
@@ -3017,7 +3015,7 @@ async def analyze_prescription_complete(
             f.write(content)
         
         extractor = ImageDocumentExtractor()
-        prescription_data = extractor.extract_prescription_data(str(temp_path))
+        prescription_data = await extractor.aextract_prescription_data(str(temp_path))
         
         if not prescription_data:
             raise HTTPException(status_code=500, detail="Failed to extract prescription data")
@@ -3025,9 +3023,9 @@ async def analyze_prescription_complete(
         # Step 2: Check OTC status if requested
         otc_results = None
         if check_otc and prescription_data.get("medicines"):
-            checker = OTCMedicationChecker()
+            checker = get_otc_checker()
             medicine_names = [med.get("name") for med in prescription_data["medicines"] if med.get("name")]
-            otc_results = checker.check_medications_batch(medicine_names)
+            otc_results = await checker.acheck_medications_batch(medicine_names)
         
         # Step 3: Store complete analysis
         analysis_doc = {
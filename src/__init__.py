@@ -16,21 +16,13 @@ def __getattr__(name):
     elif name == "HealthcareConfig":
         from .config import HealthcareConfig
         return HealthcareConfig
-    elif name == "ClassificationSchema":
-        from .schemas import ClassificationSchema
-        return ClassificationSchema
-    elif name == "SymptomCheckerSchema":
-        from .schemas import SymptomCheckerSchema
-        return SymptomCheckerSchema
-    elif name == "GovernmentSchemeSchema":
-        from .schemas import GovernmentSchemeSchema
-        return GovernmentSchemeSchema
+    elif name == "DischargeOutputSchema":
+        from .schemas import DischargeOutputSchema
+        return DischargeOutputSchema
     raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 __all__ = [
     'HealthcareWorkflow',
-    'ClassificationSchema',
-    'SymptomCheckerSchema',
-    'GovernmentSchemeSchema',
+    'DischargeOutputSchema',
     'HealthcareConfig'
 ]
@@ -11,12 +11,16 @@ Components:
 - rollouts: Agent rollout wrappers with @rollout decorator
 - graders: Reward/grading functions for training
 - datasets: Training and validation dataset loaders
+- llm_cache: On-disk LLM response cache keyed by prompt hash
+- schemas: Strict JSON schemas for structured rollout output
 
 Note: On Windows, full Agent Lightning functionality may be limited due to
 gunicorn's dependency on Unix-specific modules (fcntl). The graders and
 datasets modules work independently of Agent Lightning.
 """
 
+import importlib
+
 # Import graders first - they work without Agent Lightning
 from .graders import (
     grade_discharge_simplification,
@@ -27,31 +31,49 @@ from .graders import (
 # Import config without Agent Lightning dependency
 from .config import AgentLightningConfig
 
-# Try to import Agent Lightning-dependent modules
-AGENT_LIGHTNING_AVAILABLE = False
-IMPORT_ERROR = None
+# Agent Lightning-dependent modules are imported on first access (PEP 562),
+# so importing this package for graders/datasets stays cheap and does not
+# pay for (or fail on) the agentlightning import.
+_LAZY_ATTRS = {
+    "DISCHARGE_SIMPLIFIER_PROMPT": "prompt_templates",
+    "PATIENT_EDUCATION_PROMPT": "prompt_templates",
+    "SAFETY_GUARDRAIL_PROMPT": "prompt_templates",
+    "discharge_simplifier_rollout": "rollouts",
+    "patient_education_rollout": "rollouts",
+    "safety_check_rollout": "rollouts",
+}
+
+_availability = None  # (available, import_error) once probed
+
+
+def _probe_agent_lightning():
+    """Import the Agent Lightning-dependent modules once and record the outcome."""
+    global _availability
+    if _availability is None:
+        try:
+            importlib.import_module(".prompt_templates", __name__)
+            importlib.import_module(".rollouts", __name__)
+            _availability = (True, None)
+        except (ImportError, ModuleNotFoundError) as e:
+            _availability = (False, str(e))
+    return _availability
+
 
-try:
-    from .prompt_templates import (
-        DISCHARGE_SIMPLIFIER_PROMPT,
-        PATIENT_EDUCATION_PROMPT,
-        SAFETY_GUARDRAIL_PROMPT,
-    )
-    from .rollouts import (
-        discharge_simplifier_rollout,
-        patient_education_rollout,
-        safety_check_rollout,
-    )
-    AGENT_LIGHTNING_AVAILABLE = True
-except (ImportError, ModuleNotFoundError) as e:
-    IMPORT_ERROR = str(e)
-    # Define placeholders
-    DISCHARGE_SIMPLIFIER_PROMPT = None
-    PATIENT_EDUCATION_PROMPT = None
-    SAFETY_GUARDRAIL_PROMPT = None
-    discharge_simplifier_rollout = None
-    patient_education_rollout = None
-    safety_check_rollout = None
+def __getattr__(name):
+    if name == "AGENT_LIGHTNING_AVAILABLE":
+        return _probe_agent_lightning()[0]
+    if name == "IMPORT_ERROR":
+        return _probe_agent_lightning()[1]
+    if name in _LAZY_ATTRS:
+        available, _ = _probe_agent_lightning()
+        # Placeholder when Agent Lightning cannot be imported
+        value = None
+        if available:
+            module = importlib.import_module(f".{_LAZY_ATTRS[name]}", __name__)
+            value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 __all__ = [
     "AgentLightningConfig",
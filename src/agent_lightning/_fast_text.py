@@ -0,0 +1,112 @@
+"""
+Numba-compiled text statistics for the readability graders.
+
+Counts words, sentence terminators and syllables in a single pass over the
+ASCII bytes of a text, and applies the Flesch-Kincaid formula in the same
+compiled function. Numba is optional: when it is not installed
+NUMBA_AVAILABLE is False and the graders keep their pure-Python path.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except (ImportError, ModuleNotFoundError):
+    NUMBA_AVAILABLE = False
+
+# Bit i set for the i-th lowercase letter ('a' == bit 0) that counts as a vowel
+_VOWEL_MASK = 0
+for _c in "aeiouy":
+    _VOWEL_MASK |= 1 << (ord(_c) - ord("a"))
+del _c
+
+
+def _count_text_stats(buf):
+    """
+    Return (words, sentence_terminators, syllables) for an ASCII byte buffer.
+
+    Matches graders._text_stats: words are whitespace-separated tokens, every
+    '.', '!' or '?' counts as a terminator, and each word contributes its
+    vowel groups minus a trailing silent 'e', with a minimum of one.
+    """
+    words = 0
+    sentences = 0
+    syllables = 0
+
+    in_word = False
+    word_syllables = 0
+    prev_vowel = False
+    last = 0
+
+    for i in range(buf.shape[0]):
+        c = buf[i]
+
+        if c == 46 or c == 33 or c == 63:  # '.', '!', '?'
+            sentences += 1
+
+        # Same set as str.split() for ASCII: \t\n\v\f\r, \x1c-\x1f, space
+        if c == 32 or (9 <= c <= 13) or (28 <= c <= 31):
+            if in_word:
+                if last == 101:  # silent 'e'
+                    word_syllables -= 1
+                syllables += max(1, word_syllables)
+                words += 1
+                in_word = False
+            continue
+
+        if not in_word:
+            in_word = True
+            word_syllables = 0
+            prev_vowel = False
+
+        lower = c | 32 if 65 <= c <= 90 else c
+        is_vowel = 97 <= lower <= 122 and (_VOWEL_MASK >> (lower - 97)) & 1 == 1
+        if is_vowel and not prev_vowel:
+            word_syllables += 1
+        prev_vowel = is_vowel
+        last = lower
+
+    if in_word:
+        if last == 101:
+            word_syllables -= 1
+        syllables += max(1, word_syllables)
+        words += 1
+
+    return words, sentences, syllables
+
+
+if NUMBA_AVAILABLE:
+    count_text_stats = njit(cache=True, nogil=True)(_count_text_stats)
+else:
+    count_text_stats = _count_text_stats
+
+
+def _fk_grade(buf):
+    """Flesch-Kincaid grade for an ASCII byte buffer, as graders._fkgl computes it."""
+    words, sentences, syllables = count_text_stats(buf)
+    if words == 0:
+        return 0.0
+    sentences = max(1, sentences)
+    grade_level = 0.39 * (words / sentences) + 11.8 * (syllables / words) - 15.59
+    return max(0.0, grade_level)
+
+
+if NUMBA_AVAILABLE:
+    fk_grade = njit(cache=True, nogil=True)(_fk_grade)
+else:
+    fk_grade = _fk_grade
+
+
+def _ascii_buffer(text: str):
+    return np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+
+
+def text_stats(text: str):
+    """Run count_text_stats over an ASCII str."""
+    return count_text_stats(_ascii_buffer(text))
+
+
+def text_fk_grade(text: str) -> float:
+    """Run fk_grade over an ASCII str."""
+    return fk_grade(_ascii_buffer(text))
@@ -5,18 +5,25 @@ Provides configuration dataclass and initialization utilities for Agent Lightnin
 training infrastructure.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Optional, Dict, Any, Literal
+import asyncio
+import functools
 import os
+import threading
+import weakref
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentLightningConfig:
     """
     Configuration for Agent Lightning training.
     
     This class centralizes all the hyperparameters and settings needed
     for training healthcare agents using APO or RL algorithms.
+    
+    Instances are immutable and hashable; build them with create() to
+    apply environment defaults (e.g. MONGODB_URI).
     """
     
     # APO Algorithm Configuration
@@ -52,12 +59,20 @@ class AgentLightningConfig:
     # Resource naming
     prompt_resource_key: str = "prompt_template"
     
+    # LLM Response Cache (see llm_cache.py). Off by default: entries never
+    # expire, so sampled rollouts would replay one response per prompt
+    enable_response_cache: bool = False
+    cache_dir: Optional[str] = None  # Defaults to ~/.cache/hdms
+    
+    @classmethod
+    def create(cls, **kwargs: Any) -> "AgentLightningConfig":
+        """Create a config, filling unset values from the environment."""
+        if kwargs.get("store_type") == "mongo" and not kwargs.get("mongo_uri"):
+            kwargs["mongo_uri"] = os.getenv("MONGODB_URI", "mongodb://localhost:27017/?replicaSet=rs0")
+        return cls(**kwargs)
+    
     def __post_init__(self):
         """Validate configuration after initialization."""
-        if self.store_type == "mongo" and not self.mongo_uri:
-            # Try to get from environment
-            self.mongo_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017/?replicaSet=rs0")
-        
         if self.beam_width < 1:
             raise ValueError("beam_width must be at least 1")
         if self.branch_factor < 1:
@@ -66,26 +81,87 @@ class AgentLightningConfig:
             raise ValueError("n_runners must be at least 1")
 
 
+# One AsyncOpenAI client per event loop (httpx pools cannot cross loops);
+# _default_client serves callers outside any running loop.
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_default_client = None
+
+
+def _make_client():
+    """Build an AsyncOpenAI client with a pooled, keep-alive HTTP transport."""
+    import httpx
+    from openai import AsyncOpenAI
+    
+    api_key = os.getenv("OPENAI_API_KEY_1") or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY in environment.")
+    
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=32),
+        timeout=60.0,
+    )
+    return AsyncOpenAI(api_key=api_key, http_client=http_client)
+
+
 def get_openai_client():
     """
-    Get AsyncOpenAI client for APO algorithm.
+    Get the shared AsyncOpenAI client for APO algorithm.
+    
+    Rollouts and the APO algorithm reuse one client (and its connection
+    pool) per event loop instead of paying a new TLS handshake each call.
     
     Returns:
         AsyncOpenAI client configured from environment.
     """
-    from openai import AsyncOpenAI
+    global _default_client
     
-    api_key = os.getenv("OPENAI_API_KEY_1") or os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY in environment.")
-    
-    return AsyncOpenAI(api_key=api_key)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    
+    if loop is None:
+        if _default_client is None:
+            _default_client = _make_client()
+        return _default_client
+    
+    client = _loop_clients.get(loop)
+    if client is None:
+        client = _make_client()
+        _loop_clients[loop] = client
+    return client
+
+
+async def aclose_client():
+    """Close the shared client(s) usable from the current event loop."""
+    global _default_client
+    
+    client = _loop_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+    if _default_client is not None:
+        await _default_client.close()
+        _default_client = None
+
+
+# Serializes the memoized tracer/store factories below so concurrent callers
+# never build two tracers/stores (or Mongo connections) for the same key.
+# Those instances are process-wide shared state: every trainer created with
+# the same tracer type or Mongo URI reuses them.
+_factory_lock = threading.RLock()
 
 
 def create_apo_algorithm(config: AgentLightningConfig):
     """
     Create an APO algorithm instance with the given configuration.
     
+    A new APO is built on every call and is deliberately not memoized: it
+    holds the AsyncOpenAI client from get_openai_client(), which belongs to
+    the current event loop (or the loop-less default client). Caching the
+    APO would keep that client alive after aclose_client() closed it, or
+    reuse its connections from a later asyncio.run() loop. Create the
+    algorithm once per training run, inside the loop that will use it.
+    
     Args:
         config: AgentLightningConfig with APO hyperparameters
         
@@ -132,18 +208,14 @@ def create_trainer(config: AgentLightningConfig, algorithm, initial_resources: D
         agentlightning.Trainer instance
     """
     import agentlightning as agl
+    from .llm_cache import configure_response_cache
     
-    # Select tracer
-    if config.tracer_type == "agentops":
-        tracer = agl.AgentOpsTracer()
-    else:
-        tracer = agl.OtelTracer()
+    # Rollouts read the process-wide cache; runners inherit this setting
+    configure_response_cache(config.enable_response_cache, config.cache_dir)
     
-    # Select store
-    store = None
-    if config.store_type == "mongo":
-        from agentlightning.store.mongo import MongoLightningStore
-        store = MongoLightningStore(mongo_uri=config.mongo_uri)
+    with _factory_lock:
+        tracer = _get_tracer(config.tracer_type)
+        store = _get_store(config.store_type, config.mongo_uri)
     
     trainer_kwargs = {
         "algorithm": algorithm,
@@ -157,3 +229,22 @@ def create_trainer(config: AgentLightningConfig, algorithm, initial_resources: D
         trainer_kwargs["store"] = store
     
     return agl.Trainer(**trainer_kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_tracer(tracer_type: str):
+    """Select tracer (one instance per tracer type)."""
+    import agentlightning as agl
+    
+    if tracer_type == "agentops":
+        return agl.AgentOpsTracer()
+    return agl.OtelTracer()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_store(store_type: str, mongo_uri: Optional[str]):
+    """Select store; Mongo stores are created once per URI."""
+    if store_type == "mongo":
+        from agentlightning.store.mongo import MongoLightningStore
+        return MongoLightningStore(mongo_uri=mongo_uri)
+    return None
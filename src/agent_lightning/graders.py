@@ -11,7 +11,39 @@ making them usable even on Windows where full Agent Lightning may not work.
 
 import re
 import json
-from typing import Dict, Any, List, Optional
+import functools
+from typing import Dict, Any, List, Optional, Tuple
+
+from .schemas import DischargeOutput
+
+# Readability tokenization, compiled once at import
+_VOWEL_GROUP_RE = re.compile(r"[aeiouy]+", re.IGNORECASE)
+_SENTENCE_END_RE = re.compile(r"[.!?]")
+
+# Keyword scans: one case-insensitive alternation per keyword list instead
+# of a Python-level substring test per keyword (substring semantics kept)
+def _keyword_re(*keywords: str) -> "re.Pattern[str]":
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+_DANGER_SIGN_KW_RE = _keyword_re("fever", "pain", "breathing", "call")
+_QUERY_ACTION_KW_RE = _keyword_re("exercise", "diet", "recovery", "tips", "how to",
+                                  "after", "before", "during", "phase", "steps")
+_TIP_ACTION_KW_RE = _keyword_re("do", "avoid", "take", "eat", "drink", "rest", "walk", "call")
+_PII_REASON_KW_RE = _keyword_re("ssn", "credit card", "social security", "aadhaar", "passport")
+_REASON_QUALITY_KW_RE = _keyword_re("medical", "health", "clinical", "safe")
+
+# Danger-sign specificity: digit test via a C-level set intersection
+_DIGITS = frozenset("0123456789")
+
+# Optional Numba single-pass counter (needs numpy + numba)
+try:
+    from ._fast_text import (
+        NUMBA_AVAILABLE,
+        text_fk_grade as _fast_fk_grade,
+        text_stats as _fast_text_stats,
+    )
+except (ImportError, ModuleNotFoundError):
+    NUMBA_AVAILABLE = False
 
 
 def grade_discharge_simplification(
@@ -36,12 +68,50 @@ def grade_discharge_simplification(
     if not output or output.get("status") == "failed":
         return 0.0
     
+    summary = output.get("simplified_summary", "")
+    readability = calculate_readability(summary) if summary else None
+    return _score_discharge(output, readability)
+
+
+def grade_discharge_simplification_batch(
+    outputs: List[Dict[str, Any]],
+    expected: Optional[List[Optional[Dict[str, Any]]]] = None
+) -> List[float]:
+    """
+    Grade many discharge simplification outputs at once.
+    
+    Readability for all summaries is computed in one vectorized batch;
+    each score equals grade_discharge_simplification on the same output.
+    
+    Returns:
+        List of reward scores, aligned with outputs
+    """
+    gradable = [bool(o) and o.get("status") != "failed" for o in outputs]
+    summaries = [o.get("simplified_summary", "") if ok else "" for o, ok in zip(outputs, gradable)]
+    grades = calculate_readability_batch(summaries)
+    
+    return [
+        _score_discharge(o, float(grade) if summary else None) if ok else 0.0
+        for o, ok, summary, grade in zip(outputs, gradable, summaries, grades)
+    ]
+
+
+def _danger_sign_text(item: Any) -> str:
+    """Extract text from a danger sign given as a string or dict."""
+    if isinstance(item, str):
+        return item
+    elif isinstance(item, dict):
+        # Try common keys for text content
+        return str(item.get("sign") or item.get("description") or item.get("text") or item)
+    return str(item)
+
+
+def _score_discharge(output: DischargeOutput, readability: Optional[float]) -> float:
+    """Shared scoring for the discharge graders (readability precomputed)."""
     total_score = 0.0
     
     # 1. Readability Score (0-0.3)
-    summary = output.get("simplified_summary", "")
-    if summary:
-        readability = calculate_readability(summary)
+    if readability is not None:
         # Target is grade 6-8, penalize if too high or too low
         if 6 <= readability <= 8:
             readability_score = 0.3
@@ -54,12 +124,7 @@ def grade_discharge_simplification(
         total_score += readability_score
     
     # 2. Completeness Score (0-0.4)
-    completeness = check_completeness(output)
-    required_fields = ["has_summary", "has_action_plan", "has_danger_signs", 
-                       "has_medications", "has_follow_up"]
-    
-    fields_present = sum(1 for f in required_fields if completeness.get(f, False))
-    completeness_score = (fields_present / len(required_fields)) * 0.4
+    completeness_score = (count_required_fields(output) / REQUIRED_FIELD_COUNT) * 0.4
     total_score += completeness_score
     
     # 3. Safety Score (0-0.3)
@@ -73,23 +138,14 @@ def grade_discharge_simplification(
     
     # Bonus: Check if danger signs are specific (contain numbers or specific conditions)
     # Handle both string items and dict items (LLM may return either)
-    def extract_text(item):
-        """Extract text from string or dict."""
-        if isinstance(item, str):
-            return item
-        elif isinstance(item, dict):
-            # Try common keys for text content
-            return str(item.get("sign") or item.get("description") or item.get("text") or item)
-        return str(item)
-    
-    specific_signs = []
+    specific_signs = 0
     for s in danger_signs:
-        text = extract_text(s)
-        if any(c.isdigit() for c in text) or any(w in text.lower() for w in ["fever", "pain", "breathing", "call"]):
-            specific_signs.append(s)
-    
-    if len(specific_signs) >= 2:
-        safety_score = min(0.3, safety_score + 0.05)
+        text = _danger_sign_text(s)
+        if not _DIGITS.isdisjoint(text) or _DANGER_SIGN_KW_RE.search(text):
+            specific_signs += 1
+            if specific_signs == 2:
+                safety_score = min(0.3, safety_score + 0.05)
+                break
     
     total_score += safety_score
     
@@ -131,9 +187,7 @@ def grade_patient_education(
             query_count_score = 0.05
         
         # Score based on specificity (contains action words)
-        action_words = ["exercise", "diet", "recovery", "tips", "how to", 
-                        "after", "before", "during", "phase", "steps"]
-        specific_queries = [q for q in queries if any(w in q.lower() for w in action_words)]
+        specific_queries = [q for q in queries if _QUERY_ACTION_KW_RE.search(q)]
         specificity_score = min(0.4, (len(specific_queries) / max(len(queries), 1)) * 0.4)
         
         total_score += query_count_score + specificity_score
@@ -149,8 +203,7 @@ def grade_patient_education(
             tip_count_score = 0.0
         
         # Score based on actionability (contains verbs)
-        action_patterns = ["do", "avoid", "take", "eat", "drink", "rest", "walk", "call"]
-        actionable_tips = [t for t in tips if any(w in t.lower() for w in action_patterns)]
+        actionable_tips = [t for t in tips if _TIP_ACTION_KW_RE.search(t)]
         actionability_score = min(0.2, (len(actionable_tips) / max(len(tips), 1)) * 0.2)
         
         total_score += tip_count_score + actionability_score
@@ -198,8 +251,7 @@ def grade_safety_check(
             total_score += 0.5
         else:
             # Check if there's a good reason for marking unsafe
-            pii_keywords = ["ssn", "credit card", "social security", "aadhaar", "passport"]
-            if any(kw in reason.lower() for kw in pii_keywords):
+            if _PII_REASON_KW_RE.search(reason):
                 total_score += 0.5
             else:
                 total_score += 0.2
@@ -211,7 +263,7 @@ def grade_safety_check(
         if len(reason) >= 50:
             total_score += 0.1
         # Bonus for specific reasoning
-        if any(word in reason.lower() for word in ["medical", "health", "clinical", "safe"]):
+        if _REASON_QUALITY_KW_RE.search(reason):
             total_score += 0.05
     
     return min(1.0, total_score)
@@ -233,39 +285,91 @@ def calculate_readability(text: str) -> float:
     """
     if not text:
         return 0.0
+    return _fkgl(text)
+
+
+def _text_stats(text: str) -> Tuple[int, int, int]:
+    """Return (words, sentences, syllables) counts for Flesch-Kincaid."""
+    if NUMBA_AVAILABLE and text.isascii():
+        n_words, sentences, syllables = _fast_text_stats(text)
+        return n_words, max(1, sentences), syllables
     
     words = text.split()
-    if not words:
-        return 0.0
-    
-    sentences = max(1, text.count('.') + text.count('!') + text.count('?'))
+    sentences = max(1, len(_SENTENCE_END_RE.findall(text)))
     syllables = sum(count_syllables(word) for word in words)
+    return len(words), sentences, syllables
+
+
+@functools.lru_cache(maxsize=4096)
+def _fkgl(text: str) -> float:
+    """Memoized Flesch-Kincaid grade; APO re-grades identical outputs often."""
+    if NUMBA_AVAILABLE and text.isascii():
+        return _fast_fk_grade(text)
+    
+    n_words, sentences, syllables = _text_stats(text)
+    if not n_words:
+        return 0.0
     
     # Flesch-Kincaid formula
-    grade_level = 0.39 * (len(words) / sentences) + 11.8 * (syllables / len(words)) - 15.59
+    grade_level = 0.39 * (n_words / sentences) + 11.8 * (syllables / n_words) - 15.59
     return max(0, grade_level)
 
 
+def calculate_readability_batch(texts: List[str]):
+    """
+    Flesch-Kincaid grade for many texts at once.
+    
+    Counts are gathered per text and the formula is applied vectorized;
+    each entry equals calculate_readability on the same text.
+    
+    Returns:
+        numpy.ndarray of grade levels, aligned with texts
+    """
+    import numpy as np
+    
+    stats = np.array([_text_stats(t) if t else (0, 1, 0) for t in texts], dtype=np.float64)
+    if not len(stats):
+        return np.zeros(0)
+    
+    n_words, sentences, syllables = stats.T
+    safe_words = np.maximum(n_words, 1)
+    grades = 0.39 * (n_words / sentences) + 11.8 * (syllables / safe_words) - 15.59
+    return np.where(n_words > 0, np.maximum(grades, 0), 0.0)
+
+
+@functools.lru_cache(maxsize=200_000)
 def count_syllables(word: str) -> int:
-    """Count syllables in a word (approximation)."""
-    word = word.lower()
-    vowels = 'aeiouy'
-    count = 0
-    prev_was_vowel = False
-    
-    for char in word:
-        is_vowel = char in vowels
-        if is_vowel and not prev_was_vowel:
-            count += 1
-        prev_was_vowel = is_vowel
+    """Count syllables in a word (approximation); memoized, vocabulary repeats heavily."""
+    # Case-insensitive regex avoids a lowercased copy of every word
+    count = len(_VOWEL_GROUP_RE.findall(word))
     
     # Adjust for silent e
-    if word.endswith('e'):
+    if word.endswith(('e', 'E')):
         count -= 1
     
     return max(1, count)
 
 
+REQUIRED_FIELD_COUNT = 5
+
+
+def count_required_fields(result: Dict[str, Any]) -> int:
+    """
+    Count the required discharge fields that are present and non-empty.
+    
+    Same fields as the has_summary..has_follow_up flags of check_completeness,
+    counted directly for the grading hot path.
+    """
+    get = result.get
+    return (
+        bool(get("simplified_summary"))
+        + bool(get("action_plan"))
+        + bool(get("danger_signs"))
+        + bool(get("medication_list"))
+        + bool(get("follow_up_schedule"))
+    )
+
+
 def check_completeness(result: Dict[str, Any]) -> Dict[str, bool]:
     """Check if all required fields are present and non-empty."""
     return {
@@ -0,0 +1,200 @@
+"""
+LLM Response Cache for Agent Lightning Training
+
+Persists chat completion outputs on disk, keyed by a SHA-256 hash of the
+model, prompt version and normalized prompt text. Re-running training or
+evaluating duplicate discharge notes then returns the stored response
+instead of repeating the OpenAI round-trip.
+
+The cache is off by default: entries never expire, so with sampling
+temperatures above zero it would replay one sample per prompt forever and
+freeze the reward signal APO estimates, and it stores responses about real
+discharge notes unencrypted on disk. Enable it explicitly (e.g. for
+deterministic evaluation reruns) with configure_response_cache(True).
+
+Note: This module does NOT import agentlightning, making it usable on Windows.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bump when prompt templates change in a way that should invalidate old entries
+PROMPT_VERSION = "v1"
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "hdms"
+CACHE_FILENAME = "llm_responses.sqlite3"
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different inputs share a cache key."""
+    return " ".join(text.split())
+
+
+def make_cache_key(model: str, prompt_version: str, text: str) -> str:
+    """Build the cache key for a model/prompt-version/input triple."""
+    payload = model + prompt_version + normalize_text(text)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Small SQLite-backed key/value store for LLM responses.
+
+    SQLite handles concurrent access from multiple rollout runners, so the
+    same cache directory can be shared across worker processes.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.cache_dir / CACHE_FILENAME
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+# =============================================================================
+# Process-wide cache
+# =============================================================================
+
+_cache_enabled = False
+_cache_dir: Optional[Union[str, Path]] = None
+_response_cache: Optional[ResponseCache] = None
+
+
+def configure_response_cache(
+    enabled: bool = True,
+    cache_dir: Optional[Union[str, Path]] = None
+) -> None:
+    """Enable/disable the shared response cache and optionally relocate it."""
+    global _cache_enabled, _cache_dir, _response_cache
+
+    _cache_enabled = enabled
+    if cache_dir != _cache_dir:
+        _cache_dir = cache_dir
+        _response_cache = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the shared cache, or None when caching is disabled."""
+    global _response_cache
+
+    if not _cache_enabled:
+        return None
+    if _response_cache is None:
+        _response_cache = ResponseCache(_cache_dir)
+    return _response_cache
+
+
+def _request_key(request: Dict[str, Any]) -> str:
+    """Cache key for a chat.completions.create request."""
+    # Sampling parameters are part of the input: the same prompt at a
+    # different temperature or token budget is a different request.
+    params = {k: v for k, v in request.items() if k not in ("model", "messages")}
+    payload = {"messages": request.get("messages", []), "params": params}
+    if orjson is not None:
+        text = orjson.dumps(
+            payload,
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        ).decode("utf-8")
+    else:
+        text = json.dumps(payload, sort_keys=True, default=str)
+    return make_cache_key(request.get("model", ""), PROMPT_VERSION, text)
+
+
+def parse_json_response(text: Union[str, bytes]) -> Any:
+    """Decode a JSON model response, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _cacheable(choice: Any) -> bool:
+    """Only complete answers are stored; truncated or refused replies are not."""
+    return choice.finish_reason == "stop" and choice.message.content is not None
+
+
+def cached_chat_completion(client: Any, **request: Any) -> Optional[str]:
+    """
+    Call client.chat.completions.create and return the message content,
+    serving repeated requests from the response cache.
+
+    Responses are cached only when the model stopped on its own
+    (finish_reason "stop") with non-empty content, so a reply cut off at
+    max_tokens or a refusal is retried on the next run instead of replayed.
+
+    Args:
+        client: Synchronous OpenAI client
+        **request: Keyword arguments forwarded to chat.completions.create
+
+    Returns:
+        Optional[str]: Content of the first choice's message
+    """
+    cache = get_response_cache()
+    key = _request_key(request) if cache is not None else None
+    if key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    response = client.chat.completions.create(**request)
+    choice = response.choices[0]
+    if key is not None and _cacheable(choice):
+        cache.set(key, choice.message.content)
+    return choice.message.content
+
+
+async def acached_chat_completion(client: Any, **request: Any) -> Optional[str]:
+    """
+    Async variant of cached_chat_completion for an AsyncOpenAI client.
+
+    SQLite reads and commits run in a worker thread so they do not block
+    the event loop.
+    """
+    cache = get_response_cache()
+    key = _request_key(request) if cache is not None else None
+    if key is not None:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return cached
+
+    response = await client.chat.completions.create(**request)
+    choice = response.choices[0]
+    if key is not None and _cacheable(choice):
+        await asyncio.to_thread(cache.set, key, choice.message.content)
+    return choice.message.content
@@ -10,89 +10,21 @@ with task-specific data.
 
 import agentlightning as agl
 
+from ..prompts import (
+    DISCHARGE_SIMPLIFIER_SYSTEM_PROMPT,
+    DISCHARGE_SIMPLIFIER_USER_PROMPT,
+    PATIENT_EDUCATION_SYSTEM_PROMPT,
+    PATIENT_EDUCATION_USER_PROMPT,
+)
+
 
 # =============================================================================
 # Discharge Simplifier Prompt Template
 # =============================================================================
 
-DISCHARGE_SIMPLIFIER_TEMPLATE = """You are an expert Medical Discharge Instruction Simplifier. 
-Your goal is to transform complex clinical discharge notes into a clear, safe, and actionable guide for the patient.
-
-**INPUT DATA:**
-- Use the provided discharge note text.
-- Incorporate general medical knowledge from public care instructions (CDC/MedlinePlus equivalent).
-
-**OUTPUT REQUIREMENTS (Strict JSON Schema):**
-
-1. **simplified_summary** (REQUIRED):
-   - Write a plain-language summary at 6th-8th grade reading level
-   - Avoid medical jargon - use simple words
-   - Explain WHY they were admitted and WHAT happened
-   - Examples of simplification:
-     * "Edema" → "Swelling"
-     * "Utilize" → "Use"  
-     * "Ambulate" → "Walk"
-     * "Hypertension" → "High blood pressure"
-
-2. **action_plan** (REQUIRED):
-   - Break down by specific timeframes: "Day 1 (Today)", "Day 2", "Week 1", "Week 2", etc.
-   - Each day should have:
-     * **tasks**: Specific, clear actions (e.g., "Take 1 blue pill with breakfast", "Change bandage at 8 PM", "Walk for 10 minutes")
-     * **medications**: List of medications for that timeframe
-   - Be VERY specific with times and quantities
-
-3. **danger_signs** (REQUIRED):
-   - List immediate "Red Flags" that require calling doctor/911
-   - Be specific (e.g., "Fever over 101°F", "Chest pain", "Difficulty breathing")
-   - Include "Call 911 if you experience any of these"
-
-4. **medication_list** (REQUIRED):
-   - Format: "Name - Purpose - Usage"
-   - Example: "Metformin - For blood sugar - Take 1 pill with breakfast and dinner"
-   - Include ALL medications mentioned in discharge notes
-
-5. **wound_care** (OPTIONAL):
-   - Specific wound care instructions if applicable
-   - Include frequency and technique
-
-6. **activity_restrictions** (OPTIONAL):
-   - What they CANNOT do
-   - Examples: "No lifting over 5 lbs", "No driving for 2 weeks"
-
-7. **follow_up_schedule** (REQUIRED):
-   - Who to see, when, and why
-   - Format: 
-     * specialist: "Cardiologist", "Primary Care Doctor"
-     * when: "Within 1 week", "In 2 weeks"
-     * purpose: "Check heart function", "Remove stitches"
-
-8. **lifestyle_changes** (REQUIRED):
-   - Diet modifications, exercise, smoking cessation, etc.
-   - Be specific and actionable
-
-9. **citations** (REQUIRED):
-   - Add links to trusted public sources relevant to their condition
-   - Examples: "MedlinePlus: Heart Failure Care", "CDC: Diabetes Management"
-
-**TONE:**
-- Empathetic, clear, and directive
-- Use "you" language (e.g., "You should take...")
-- Be encouraging but realistic
-
-**SAFETY:**
-- If critical values or severe conditions are mentioned, highlight them in danger signs
-- Do NOT make up medications not in the text
-- If information is missing, say "Ask your doctor about..."
-
-**READABILITY:**
-- Target 6th-8th grade reading level (Flesch-Kincaid)
-- Short sentences (under 20 words)
-- Active voice
-- Common words only
-
-Here are the discharge instructions/medical notes:
-
-{input_text}"""
+DISCHARGE_SIMPLIFIER_TEMPLATE = (
+    DISCHARGE_SIMPLIFIER_SYSTEM_PROMPT + "\n\n" + DISCHARGE_SIMPLIFIER_USER_PROMPT
+)
 
 DISCHARGE_SIMPLIFIER_PROMPT = agl.PromptTemplate(
     template=DISCHARGE_SIMPLIFIER_TEMPLATE,
@@ -104,27 +36,9 @@ DISCHARGE_SIMPLIFIER_PROMPT = agl.PromptTemplate(
 # Patient Education Prompt Template  
 # =============================================================================
 
-PATIENT_EDUCATION_TEMPLATE = """You are a Patient Education Expert.
-Your goal is to find the best Search Queries to find helpful RECOVERY and REHABILITATION videos on YouTube for a patient.
-
-**INPUT:**
-- Patient's condition or procedure (e.g., "Total Knee Replacement", "Heart Failure", "Type 2 Diabetes")
-
-**OUTPUT requirements (JSON):**
-1. **search_queries**: Generate 3-5 specific, safe search queries for YouTube.
-   - Focus on: "Exercises for...", "Diet for...", "Recovery tips for...", "What to expect after..."
-   - AVOID generic "Yoga" unless specifically helpful for mobility.
-   - Example: ["Post-op knee exercises phase 1", "How to climb stairs after knee replacement", "Anti-inflammatory diet for knee pain"]
-
-2. **recovery_tips**: List 3 key quick tips for this condition.
-
-**JSON FORMAT:**
-{{
-    "search_queries": ["query1", "query2", "query3"],
-    "recovery_tips": ["tip1", "tip2", "tip3"]
-}}
-
-Patient condition/context: {context}"""
+PATIENT_EDUCATION_TEMPLATE = (
+    PATIENT_EDUCATION_SYSTEM_PROMPT + "\n\n" + PATIENT_EDUCATION_USER_PROMPT
+)
 
 PATIENT_EDUCATION_PROMPT = agl.PromptTemplate(
     template=PATIENT_EDUCATION_TEMPLATE,
@@ -0,0 +1,38 @@
+"""
+Console Reporting Helpers for Agent Lightning Training
+
+Training scripts print banners and per-round results many lines at a time.
+ReportBuffer collects those lines and writes each block to stdout in a single
+call instead of one print() per line.
+
+Note: This module does NOT import agentlightning, making it usable on Windows.
+"""
+
+import sys
+from typing import List, Optional, TextIO
+
+
+class ReportBuffer:
+    """Accumulates report lines and writes them out together on flush()."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self._stream = stream
+        self._parts: List[str] = []
+
+    def line(self, text: object = "") -> None:
+        """Queue one line of output."""
+        self._parts.append(str(text))
+
+    def banner(self, title: str, width: int = 80, char: str = "=") -> None:
+        """Queue a title framed by rule lines."""
+        rule = char * width
+        self._parts.extend((rule, title, rule))
+
+    def flush(self) -> None:
+        """Write all queued lines with a single write call."""
+        if not self._parts:
+            return
+        stream = self._stream or sys.stdout
+        stream.write("\n".join(self._parts) + "\n")
+        stream.flush()
+        self._parts.clear()
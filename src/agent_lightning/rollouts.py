@@ -13,9 +13,8 @@ Each rollout:
 
 import agentlightning as agl
 from openai import OpenAI
+import asyncio
 import os
-import json
-import re
 from typing import Dict, Any, TypedDict, Optional
 
 from .graders import (
@@ -23,6 +22,33 @@ from .graders import (
     grade_patient_education,
     grade_safety_check,
 )
+from .llm_cache import (
+    acached_chat_completion,
+    cached_chat_completion,
+    parse_json_response,
+)
+from .schemas import DISCHARGE_RESPONSE_FORMAT
+
+
+# =============================================================================
+# OpenAI Client
+# =============================================================================
+
+_CLIENT: Optional[OpenAI] = None
+
+
+def _get_client() -> OpenAI:
+    """
+    Return the process-wide synchronous OpenAI client.
+    
+    Reusing one client keeps its connection pool (and the TLS sessions in it)
+    alive across rollouts instead of reconnecting on every call.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        api_key = os.getenv("OPENAI_API_KEY_1") or os.getenv("OPENAI_API_KEY")
+        _CLIENT = OpenAI(api_key=api_key)
+    return _CLIENT
 
 
 # =============================================================================
@@ -69,16 +95,15 @@ def discharge_simplifier_rollout(
     Returns:
         float: Reward score [0, 1] based on readability, completeness, safety
     """
-    # Get OpenAI client
-    api_key = os.getenv("OPENAI_API_KEY_1") or os.getenv("OPENAI_API_KEY")
-    client = OpenAI(api_key=api_key)
+    client = _get_client()
     
     # Format prompt with task data
     prompt = prompt_template.format(input_text=task["document_text"])
     
     # Call LLM with structured output request
     try:
-        response = client.chat.completions.create(
+        result_text = cached_chat_completion(
+            client,
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You must respond with valid JSON only."},
@@ -86,11 +111,10 @@ def discharge_simplifier_rollout(
             ],
             temperature=0.3,
             max_tokens=2000,
-            response_format={"type": "json_object"}
+            response_format=DISCHARGE_RESPONSE_FORMAT
         )
         
-        result_text = response.choices[0].message.content
-        result = json.loads(result_text)
+        result = parse_json_response(result_text)
         result["status"] = "success"
         
     except Exception as e:
@@ -130,14 +154,14 @@ def patient_education_rollout(
     Returns:
         float: Reward score based on query quality and tip relevance
     """
-    api_key = os.getenv("OPENAI_API_KEY_1") or os.getenv("OPENAI_API_KEY")
-    client = OpenAI(api_key=api_key)
+    client = _get_client()
     
     # Format prompt
     prompt = prompt_template.format(context=task["context"])
     
     try:
-        response = client.chat.completions.create(
+        result_text = cached_chat_completion(
+            client,
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "Respond with valid JSON only."},
@@ -148,8 +172,7 @@ def patient_education_rollout(
             response_format={"type": "json_object"}
         )
         
-        result_text = response.choices[0].message.content
-        result = json.loads(result_text)
+        result = parse_json_response(result_text)
         
     except Exception as e:
         print(f"Education rollout error: {e}")
@@ -184,14 +207,14 @@ def safety_check_rollout(
     Returns:
         float: Reward score based on classification accuracy
     """
-    api_key = os.getenv("OPENAI_API_KEY_1") or os.getenv("OPENAI_API_KEY")
-    client = OpenAI(api_key=api_key)
+    client = _get_client()
     
     # Format prompt
     prompt = prompt_template.format(input=task["text"])
     
     try:
-        response = client.chat.completions.create(
+        result_text = cached_chat_completion(
+            client,
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You are a safety checker. Respond with JSON only."},
@@ -202,8 +225,7 @@ def safety_check_rollout(
             response_format={"type": "json_object"}
         )
         
-        result_text = response.choices[0].message.content
-        result = json.loads(result_text)
+        result = parse_json_response(result_text)
         
     except Exception as e:
         print(f"Safety rollout error: {e}")
@@ -246,22 +268,22 @@ def discharge_workflow_rollout(
     """
     from .prompt_templates import SAFETY_GUARDRAIL_PROMPT
     
-    api_key = os.getenv("OPENAI_API_KEY_1") or os.getenv("OPENAI_API_KEY")
-    client = OpenAI(api_key=api_key)
+    client = _get_client()
     
     # Step 1: Safety Check (using fixed prompt - not optimized here)
     with agl.operation(name="safety_check") as op:
         safety_prompt = SAFETY_GUARDRAIL_PROMPT.format(input=task["document_text"])
         
         try:
-            safety_response = client.chat.completions.create(
+            safety_text = cached_chat_completion(
+                client,
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": safety_prompt}],
                 temperature=0.1,
                 max_tokens=200,
                 response_format={"type": "json_object"}
             )
-            safety_result = json.loads(safety_response.choices[0].message.content)
+            safety_result = parse_json_response(safety_text)
         except:
             safety_result = {"is_safe": True, "reason": "Parse error"}
         
@@ -280,7 +302,8 @@ def discharge_workflow_rollout(
         prompt = prompt_template.format(input_text=task["document_text"])
         
         try:
-            response = client.chat.completions.create(
+            result_text = cached_chat_completion(
+                client,
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "Respond with valid JSON only."},
@@ -288,9 +311,9 @@ def discharge_workflow_rollout(
                 ],
                 temperature=0.3,
                 max_tokens=2000,
-                response_format={"type": "json_object"}
+                response_format=DISCHARGE_RESPONSE_FORMAT
             )
-            result = json.loads(response.choices[0].message.content)
+            result = parse_json_response(result_text)
             result["status"] = "success"
         except Exception as e:
             result = {"status": "failed", "error": str(e)}
@@ -310,3 +333,100 @@ def discharge_workflow_rollout(
     })
     
     return final_reward
+
+
+@agl.rollout
+async def discharge_workflow_rollout_async(
+    task: DischargeTask,
+    prompt_template: agl.PromptTemplate,
+    rollout: agl.Rollout = None
+) -> float:
+    """
+    Async variant of discharge_workflow_rollout.
+    
+    The safety check and the discharge simplification are sent to OpenAI
+    concurrently over the shared AsyncOpenAI client. Most documents pass the
+    safety check, so the simplification result is used unless the safety
+    step rejects the document, in which case it is discarded.
+    
+    Args:
+        task: DischargeTask with document_text
+        prompt_template: Main discharge simplifier prompt
+        rollout: Rollout context (optional, for accessing mode)
+        
+    Returns:
+        float: Combined reward from all steps
+    """
+    from .config import get_openai_client
+    from .prompt_templates import SAFETY_GUARDRAIL_PROMPT
+    
+    client = get_openai_client()
+    
+    safety_task = asyncio.create_task(acached_chat_completion(
+        client,
+        model="gpt-4o-mini",
+        messages=[{
+            "role": "user",
+            "content": SAFETY_GUARDRAIL_PROMPT.format(input=task["document_text"])
+        }],
+        temperature=0.1,
+        max_tokens=200,
+        response_format={"type": "json_object"}
+    ))
+    main_task = asyncio.create_task(acached_chat_completion(
+        client,
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "Respond with valid JSON only."},
+            {"role": "user", "content": prompt_template.format(input_text=task["document_text"])}
+        ],
+        temperature=0.3,
+        max_tokens=2000,
+        response_format=DISCHARGE_RESPONSE_FORMAT
+    ))
+    safety_text, result_text = await asyncio.gather(
+        safety_task, main_task, return_exceptions=True
+    )
+    
+    # Step 1: Safety Check (using fixed prompt - not optimized here)
+    with agl.operation(name="safety_check") as op:
+        try:
+            if isinstance(safety_text, BaseException):
+                raise safety_text
+            safety_result = parse_json_response(safety_text)
+        except Exception:
+            safety_result = {"is_safe": True, "reason": "Parse error"}
+        
+        op.set_output(safety_result)
+        
+        safety_reward = grade_safety_check(safety_result, text=task["document_text"])
+        agl.emit_reward(safety_reward * 0.2, attributes={"step": "safety_check"})
+    
+    # Step 2: Discharge Simplification (discarded if unsafe)
+    if not safety_result.get("is_safe", True):
+        agl.emit_message("Document blocked by safety check")
+        return 0.1  # Minimal reward for correct rejection
+    
+    with agl.operation(name="discharge_simplification") as op:
+        try:
+            if isinstance(result_text, BaseException):
+                raise result_text
+            result = parse_json_response(result_text)
+            result["status"] = "success"
+        except Exception as e:
+            result = {"status": "failed", "error": str(e)}
+        
+        op.set_output(result)
+    
+    main_reward = grade_discharge_simplification(result, task.get("expected_output"))
+    
+    # Combine rewards: 20% safety, 80% main task
+    final_reward = (safety_reward * 0.2) + (main_reward * 0.8)
+    
+    agl.emit_reward(final_reward, attributes={
+        "step": "final",
+        "safety_reward": safety_reward,
+        "main_reward": main_reward,
+    })
+    
+    return final_reward
@@ -0,0 +1,75 @@
+"""
+JSON Schemas for Structured LLM Output in Rollouts
+
+OpenAI strict structured output (response_format type "json_schema")
+constrains the model to these shapes, so rollout responses parse on the
+first attempt. DISCHARGE_SCHEMA mirrors src.schemas.DischargeOutputSchema.
+
+Note: This module does NOT import agentlightning, making it usable on Windows.
+"""
+
+from typing import Any, Dict, List, Optional, TypedDict
+
+
+class DischargeOutput(TypedDict, total=False):
+    """Parsed discharge simplifier response, as consumed by the graders."""
+    simplified_summary: str
+    action_plan: List[Dict[str, Any]]
+    danger_signs: List[Any]
+    medication_list: List[str]
+    wound_care: Optional[str]
+    activity_restrictions: Optional[str]
+    follow_up_schedule: List[Dict[str, Any]]
+    lifestyle_changes: List[str]
+    citations: List[str]
+    status: str
+
+
+def _string_list() -> Dict[str, Any]:
+    return {"type": "array", "items": {"type": "string"}}
+
+
+def _object(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Strict mode requires every property listed and no extras."""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+DISCHARGE_SCHEMA: Dict[str, Any] = _object({
+    "simplified_summary": {"type": "string"},
+    "action_plan": {
+        "type": "array",
+        "items": _object({
+            "day": {"type": "string"},
+            "tasks": _string_list(),
+            "medications": _string_list(),
+        }),
+    },
+    "danger_signs": _string_list(),
+    "medication_list": _string_list(),
+    "wound_care": {"type": ["string", "null"]},
+    "activity_restrictions": {"type": ["string", "null"]},
+    "follow_up_schedule": {
+        "type": "array",
+        "items": _object({
+            "specialist": {"type": "string"},
+            "when": {"type": "string"},
+            "purpose": {"type": "string"},
+        }),
+    },
+    "lifestyle_changes": _string_list(),
+    "citations": _string_list(),
+})
+
+DISCHARGE_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "DischargeOutput",
+        "schema": DISCHARGE_SCHEMA,
+        "strict": True,
+    },
+}
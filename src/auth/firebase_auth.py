@@ -1,82 +1,153 @@
 """
 Firebase authentication utilities
 """
+import asyncio
+import hashlib
+import logging
 import os
+import threading
+import time
 import firebase_admin
+from cachetools import TLRUCache
 from firebase_admin import credentials, auth
-from typing import Optional
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 # Initialize Firebase Admin SDK (only once)
 _firebase_initialized = False
 
+# Credential settings are read once at import (.env is loaded before this
+# module is imported); the parsed credential is reused on init retries
+FIREBASE_SERVICE_ACCOUNT_PATH = os.getenv("FIREBASE_SERVICE_ACCOUNT_PATH")
+FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID")
+FIREBASE_PRIVATE_KEY = os.getenv("FIREBASE_PRIVATE_KEY")
+FIREBASE_CLIENT_EMAIL = os.getenv("FIREBASE_CLIENT_EMAIL")
+_cached_cred = None
+
+# Verified tokens, keyed by a hash of the raw token. Entries live for at most
+# TOKEN_CACHE_TTL seconds and never past the token's own "exp" claim.
+TOKEN_CACHE_TTL = 300
+_token_cache_lock = threading.Lock()
+
+
+def _token_ttu(_key, decoded_token: dict, now: float) -> float:
+    return min(now + TOKEN_CACHE_TTL, decoded_token.get("exp", now))
+
+
+_token_cache = TLRUCache(maxsize=10000, ttu=_token_ttu, timer=time.time)
+
+
+def _token_cache_key(id_token: str) -> str:
+    return hashlib.sha256(id_token.encode()).hexdigest()[:32]
+
+
+_init_lock = threading.Lock()
+
+
 def initialize_firebase():
     """Initialize Firebase Admin SDK with service account"""
-    global _firebase_initialized
-    
+    # Double-checked locking: the steady-state path never takes the lock, and
+    # concurrent first requests cannot call initialize_app() twice
     if _firebase_initialized:
         return
     
-    try:
-        # Option 1: Use service account JSON file
-        cred_path = os.getenv("FIREBASE_SERVICE_ACCOUNT_PATH")
-        print(f"🔍 Looking for Firebase credentials at: {cred_path}")
-        
-        if cred_path and os.path.exists(cred_path):
-            print(f"✓ Found service account file at: {cred_path}")
-            cred = credentials.Certificate(cred_path)
-            firebase_admin.initialize_app(cred)
-            _firebase_initialized = True
-            print("✓ Firebase Admin SDK initialized with service account")
+    with _init_lock:
+        if _firebase_initialized:
             return
-        else:
-            if cred_path:
-                print(f"❌ Service account file not found at: {cred_path}")
-            else:
-                print("❌ FIREBASE_SERVICE_ACCOUNT_PATH not set in .env")
-        
-        # Option 2: Use environment variables to construct credentials
-        project_id = os.getenv("FIREBASE_PROJECT_ID")
-        private_key = os.getenv("FIREBASE_PRIVATE_KEY")
-        client_email = os.getenv("FIREBASE_CLIENT_EMAIL")
+        _initialize_firebase()
+    
+    if _firebase_initialized:
+        threading.Thread(
+            target=_prefetch_public_certs, name="firebase-cert-prefetch", daemon=True
+        ).start()
+
+
+def _prefetch_public_certs():
+    """
+    Fetch Google's ID-token signing certs through the SDK's token verifier.
+    
+    The verifier's HTTP session honours cache-control, so the first real
+    verify_id_token call then finds the certs cached instead of paying the
+    HTTPS round-trip on a user request.
+    """
+    try:
+        from firebase_admin import _token_gen
         
-        if project_id and private_key and client_email:
-            print("🔍 Attempting to initialize with environment variables...")
+        client = auth._get_client(firebase_admin.get_app())
+        client._token_verifier.request(url=_token_gen.ID_TOKEN_CERT_URI)
+        logger.debug("Prefetched Firebase public certificates")
+    except Exception as e:
+        logger.debug("Could not prefetch Firebase public certificates: %s", e)
+
+
+def _load_credentials() -> Optional[Tuple[credentials.Base, str]]:
+    """Parse the configured credentials once; returns (credential, source) or None."""
+    global _cached_cred
+    
+    if _cached_cred is not None:
+        return _cached_cred
+    
+    # Option 1: Use service account JSON file
+    logger.debug("Looking for Firebase credentials at: %s", FIREBASE_SERVICE_ACCOUNT_PATH)
+    if FIREBASE_SERVICE_ACCOUNT_PATH:
+        try:
+            cred = credentials.Certificate(FIREBASE_SERVICE_ACCOUNT_PATH)
+            _cached_cred = (cred, "service account")
+            return _cached_cred
+        except FileNotFoundError:
+            logger.warning("Service account file not found at: %s", FIREBASE_SERVICE_ACCOUNT_PATH)
+    else:
+        logger.debug("FIREBASE_SERVICE_ACCOUNT_PATH not set in .env")
+    
+    # Option 2: Use environment variables to construct credentials
+    if FIREBASE_PROJECT_ID and FIREBASE_PRIVATE_KEY and FIREBASE_CLIENT_EMAIL:
+        logger.debug("Attempting to initialize with environment variables...")
+        cred_dict = {
+            "type": "service_account",
+            "project_id": FIREBASE_PROJECT_ID,
             # Replace literal \n with actual newlines in private key
-            private_key = private_key.replace('\\n', '\n')
-            
-            cred_dict = {
-                "type": "service_account",
-                "project_id": project_id,
-                "private_key": private_key,
-                "client_email": client_email,
-                "token_uri": "https://oauth2.googleapis.com/token",
-            }
-            cred = credentials.Certificate(cred_dict)
+            "private_key": FIREBASE_PRIVATE_KEY.replace('\\n', '\n'),
+            "client_email": FIREBASE_CLIENT_EMAIL,
+            "token_uri": "https://oauth2.googleapis.com/token",
+        }
+        _cached_cred = (credentials.Certificate(cred_dict), "environment variables")
+        return _cached_cred
+    
+    logger.debug("Firebase environment variables not set (FIREBASE_PROJECT_ID, FIREBASE_PRIVATE_KEY, FIREBASE_CLIENT_EMAIL)")
+    return None
+
+
+def _initialize_firebase():
+    global _firebase_initialized
+    
+    try:
+        loaded = _load_credentials()
+        if loaded is not None:
+            cred, source = loaded
             firebase_admin.initialize_app(cred)
             _firebase_initialized = True
-            print("✓ Firebase Admin SDK initialized with environment variables")
+            logger.info("Firebase Admin SDK initialized with %s", source)
             return
-        else:
-            print("❌ Firebase environment variables not set (FIREBASE_PROJECT_ID, FIREBASE_PRIVATE_KEY, FIREBASE_CLIENT_EMAIL)")
         
         # Option 3: Use default credentials (if deployed on GCP)
         try:
             firebase_admin.initialize_app()
             _firebase_initialized = True
-            print("✓ Firebase Admin SDK initialized with default credentials")
+            logger.info("Firebase Admin SDK initialized with default credentials")
             return
         except Exception as e2:
-            print(f"❌ Default credentials also failed: {e2}")
+            logger.debug("Default credentials also failed: %s", e2)
         
-        print("⚠️ Firebase Admin SDK not initialized - no credentials found")
-        print("   Option 1: Set FIREBASE_SERVICE_ACCOUNT_PATH in .env")
-        print("   Option 2: Set FIREBASE_PROJECT_ID, FIREBASE_PRIVATE_KEY, FIREBASE_CLIENT_EMAIL in .env")
-        print("   Option 3: Deploy to GCP with default credentials")
+        logger.warning(
+            "Firebase Admin SDK not initialized - no credentials found\n"
+            "   Option 1: Set FIREBASE_SERVICE_ACCOUNT_PATH in .env\n"
+            "   Option 2: Set FIREBASE_PROJECT_ID, FIREBASE_PRIVATE_KEY, FIREBASE_CLIENT_EMAIL in .env\n"
+            "   Option 3: Deploy to GCP with default credentials"
+        )
     
     except Exception as e:
-        print(f"⚠️ Firebase initialization error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Firebase initialization error: %s", e)
 
 
 def verify_firebase_token(id_token: str, clock_skew_seconds: int = 10) -> Optional[dict]:
@@ -91,21 +162,57 @@ def verify_firebase_token(id_token: str, clock_skew_seconds: int = 10) -> Option
         Decoded token dict with user info or None if invalid
     """
     if not _firebase_initialized:
-        print("⚠️ Attempting to verify token but Firebase not initialized")
+        logger.debug("Attempting to verify token but Firebase not initialized")
         initialize_firebase()
     
     if not _firebase_initialized:
-        print("❌ Cannot verify token - Firebase Admin SDK not initialized")
+        logger.warning("Cannot verify token - Firebase Admin SDK not initialized")
         return None
     
+    key = _token_cache_key(id_token)
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+    if cached is not None:
+        return cached
+    
     try:
         # Verify the ID token with clock skew tolerance
-        print(f"🔐 Verifying Firebase token...")
+        logger.debug("Verifying Firebase token...")
         decoded_token = auth.verify_id_token(id_token, clock_skew_seconds=clock_skew_seconds)
-        print(f"✓ Token verified for user: {decoded_token.get('email')}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Token verified for user: %s", decoded_token.get("email"))
+        # Only successful verifications are cached
+        with _token_cache_lock:
+            _token_cache[key] = decoded_token
         return decoded_token
     except Exception as e:
         # It's common for this to fail if the token is a Custom JWT (not Firebase)
         # We process this silently or with a debug log to allow fallback methods to work
-        # print(f"ℹ️ Firebase token verification failed (likely Custom JWT): {e}") 
+        logger.debug("Firebase token verification failed (likely Custom JWT): %s", e)
         return None
+
+
+async def averify_firebase_token(id_token: str, clock_skew_seconds: int = 10) -> Optional[dict]:
+    """
+    Async variant of verify_firebase_token for the FastAPI handlers.
+    
+    Cached tokens are returned directly on the event loop; only a real
+    verification (RSA check, possibly a cert fetch) is moved to a thread.
+    """
+    if _firebase_initialized:
+        with _token_cache_lock:
+            cached = _token_cache.get(_token_cache_key(id_token))
+        if cached is not None:
+            return cached
+    
+    return await asyncio.to_thread(
+        verify_firebase_token, id_token, clock_skew_seconds=clock_skew_seconds
+    )
+
+
+async def verify_many(id_tokens: List[str], clock_skew_seconds: int = 10) -> List[Optional[dict]]:
+    """Verify several ID tokens concurrently; results are in input order."""
+    return await asyncio.gather(*(
+        averify_firebase_token(token, clock_skew_seconds=clock_skew_seconds)
+        for token in id_tokens
+    ))
@@ -2,8 +2,20 @@
 Chain package initialization - Discharge Simplification focused
 """
 
-from .base_chains import SafetyGuardrailChain
-from .specialized_chains import DischargeSimplifierChain
+# Lazy imports: importing one chain module (e.g. src.chains.base_chains)
+# should not also build every other module's prompt templates
+
+
+def __getattr__(name):
+    """Lazy load chain classes only when accessed"""
+    if name == "SafetyGuardrailChain":
+        from .base_chains import SafetyGuardrailChain
+        return SafetyGuardrailChain
+    elif name == "DischargeSimplifierChain":
+        from .specialized_chains import DischargeSimplifierChain
+        return DischargeSimplifierChain
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
 
 __all__ = [
     'SafetyGuardrailChain',
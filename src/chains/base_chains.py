@@ -3,39 +3,58 @@ Minimal chain implementations for Discharge Simplification workflow
 """
 
 from typing import Dict, Any
+import hashlib
 import json
+import logging
 import re
+import threading
+from cachetools import LRUCache
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
+from ..security.pii import detect_pii
+
+logger = logging.getLogger(__name__)
+
+# orjson is optional; its decode errors subclass ValueError, as json's do
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# JSON clean-up patterns, compiled once at import
+_LINE_COMMENT = re.compile(r'//.*?(?=\n|$)')
+_BLOCK_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_JSON_FENCE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
 
 def robust_json_parse(text: str) -> Dict[str, Any]:
     """Parse JSON with comment removal and error handling"""
+    # Fast path: well-formed model output parses without any regex passes
+    try:
+        return _json_loads(text)
+    except ValueError:
+        pass
+    
     try:
         # Remove // comments
-        text = re.sub(r'//.*?(?=\n|$)', '', text)
+        text = _LINE_COMMENT.sub('', text)
         # Remove /* */ comments
-        text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
+        text = _BLOCK_COMMENT.sub('', text)
         # Parse JSON
-        return json.loads(text)
-    except json.JSONDecodeError as e:
+        return _json_loads(text)
+    except ValueError as e:
         # Try to extract JSON from markdown code blocks
-        match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
+        match = _JSON_FENCE.search(text)
         if match:
-            return json.loads(match.group(1))
+            return _json_loads(match.group(1))
         raise e
 
 
-class SafetyGuardrailChain:
-    """
-    Minimal safety check for discharge document processing.
-    Only checks for PII and harmful content - no intent classification needed.
-    """
-    
-    def __init__(self, llm):
-        self.llm = llm
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a safety checker for medical discharge documents.
+# Built once at import; every SafetyGuardrailChain shares it
+_SAFETY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a safety checker for medical discharge documents.
 
 **YOUR ONLY JOB:**
 Check if the input contains:
@@ -46,18 +65,50 @@ Check if the input contains:
 - Medical conditions, symptoms, and health information are SAFE and expected.
 - Return JSON: {{"is_safe": true/false, "reason": "explanation"}}
 """),
-            ("user", "{input}")
-        ])
+    ("user", "{input}")
+])
+
+
+class SafetyGuardrailChain:
+    """
+    Minimal safety check for discharge document processing.
+    Only checks for PII and harmful content - no intent classification needed.
+    """
+    
+    __slots__ = ('llm', 'prompt', 'chain', '_cache', '_cache_lock')
+    
+    def __init__(self, llm):
+        self.llm = llm
+        self.prompt = _SAFETY_PROMPT
+        self.chain = self.prompt | self.llm | StrOutputParser()
+        # Bounded verdict cache keyed by a fixed-size digest of the text, so
+        # re-checking the same document skips the LLM without letting large
+        # distinct inputs grow memory
+        self._cache = LRUCache(maxsize=512)
+        self._cache_lock = threading.Lock()
     
     def check(self, text: str) -> Dict[str, Any]:
         """Check if text is safe to process"""
-        chain = self.prompt | self.llm | StrOutputParser()
-        result_str = chain.invoke({"input": text})
+        # Structured PII is caught without an LLM round-trip; the model is
+        # still needed for harmful-content judgements
+        pii = detect_pii(text)
+        if pii:
+            return {"is_safe": False, "reason": f"PII detected (regex): {pii}"}
+        
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        
+        result_str = self.chain.invoke({"input": text})
         
         try:
             result = robust_json_parse(result_str)
+            with self._cache_lock:
+                self._cache[key] = dict(result)
             return result
         except Exception as e:
-            print(f"⚠️ Safety check parsing failed: {e}")
+            logger.warning("Safety check parsing failed: %s", e)
             # Default to safe if parsing fails
             return {"is_safe": True, "reason": "Parsing error - defaulting to safe"}
@@ -5,15 +5,12 @@ from typing import Dict, Any
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
+# Prompts and the output parser are stateless; build them once at import
+# rather than in every chain constructor
+_STR_PARSER = StrOutputParser()
 
-class DocumentQAChain:
-    """Answer questions about user's uploaded medical documents"""
-    
-    def __init__(self, llm):
-        self.llm = llm
-        
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a medical document analyst helping users understand their medical reports.
+_DOCUMENT_QA_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a medical document analyst helping users understand their medical reports.
 
 IMPORTANT RULES:
 1. Base your answers ONLY on the provided document content
@@ -24,14 +21,65 @@ IMPORTANT RULES:
 6. Cite the specific document when answering
 
 Be conversational and helpful. If the user's question is vague, ask for clarification."""),
-            ("user", """{context}
+    ("user", """{context}
 
 User Question: {query}
 
 Provide a clear, helpful answer based on the document content above.""")
-        ])
+])
+
+_SYMPTOM_ASSESSMENT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a medical assistant conducting a symptom assessment. 
+
+YOUR GOAL: Gather enough information to provide accurate recommendations.
+
+CONVERSATION FLOW:
+1. If the user's initial message is vague (e.g., "I have burns", "headache", "stomach pain"):
+   - Ask MAXIMUM 2 focused questions to understand the most critical details:
+     * Severity (mild/moderate/severe) AND Location (where exactly)
+     * OR Duration (how long) AND Context (how it started)
+   - Combine multiple aspects in ONE question when possible
+   - Keep questions natural and conversational
+
+2. After getting answers, respond with:
+   ASSESSMENT_COMPLETE: [detailed description of symptoms]
+
+3. DO NOT ask more than 2 follow-up questions total
+4. If user provides reasonable detail in their first or second response, mark ASSESSMENT_COMPLETE
+
+EXAMPLES:
+User: "I have burns"
+You: "I'm sorry to hear that. Can you tell me where the burn is located and how severe it is (just red, or are there blisters)?"
+
+User: "It's on my hand with blisters from a hot pan"
+You: "ASSESSMENT_COMPLETE: Second-degree burn on hand with blisters, caused by hot pan contact"
+
+User: "I have a headache"
+You: "I'm sorry to hear that. How severe is the pain (1-10) and how long have you had it?"
+
+User: "About 7/10 for 2 days"
+You: "ASSESSMENT_COMPLETE: Moderate to severe headache (7/10 intensity) lasting 2 days"
+
+Be empathetic, clear, and professional. Get to recommendations quickly.
+
+LANGUAGE INSTRUCTION: Respond in {response_language}."""),
+    ("user", """{conversation_history}
+
+Current message: {query}
+
+Respond naturally. Either ask a follow-up question OR mark as ASSESSMENT_COMPLETE.""")
+])
+
+
+class DocumentQAChain:
+    """Answer questions about user's uploaded medical documents"""
+    
+    def __init__(self, llm):
+        self.llm = llm
         
-        self.chain = self.prompt | self.llm | StrOutputParser()
+        self.prompt = _DOCUMENT_QA_PROMPT
+        
+        self.chain = self.prompt | self.llm | _STR_PARSER
     
     def run(self, query: str, document_context: str) -> str:
         """
@@ -76,49 +124,9 @@ class ConversationalSymptomChecker:
     def __init__(self, llm):
         self.llm = llm
         
-        self.assessment_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a medical assistant conducting a symptom assessment. 
-
-YOUR GOAL: Gather enough information to provide accurate recommendations.
-
-CONVERSATION FLOW:
-1. If the user's initial message is vague (e.g., "I have burns", "headache", "stomach pain"):
-   - Ask MAXIMUM 2 focused questions to understand the most critical details:
-     * Severity (mild/moderate/severe) AND Location (where exactly)
-     * OR Duration (how long) AND Context (how it started)
-   - Combine multiple aspects in ONE question when possible
-   - Keep questions natural and conversational
-
-2. After getting answers, respond with:
-   ASSESSMENT_COMPLETE: [detailed description of symptoms]
-
-3. DO NOT ask more than 2 follow-up questions total
-4. If user provides reasonable detail in their first or second response, mark ASSESSMENT_COMPLETE
-
-EXAMPLES:
-User: "I have burns"
-You: "I'm sorry to hear that. Can you tell me where the burn is located and how severe it is (just red, or are there blisters)?"
-
-User: "It's on my hand with blisters from a hot pan"
-You: "ASSESSMENT_COMPLETE: Second-degree burn on hand with blisters, caused by hot pan contact"
-
-User: "I have a headache"
-You: "I'm sorry to hear that. How severe is the pain (1-10) and how long have you had it?"
-
-User: "About 7/10 for 2 days"
-You: "ASSESSMENT_COMPLETE: Moderate to severe headache (7/10 intensity) lasting 2 days"
-
-Be empathetic, clear, and professional. Get to recommendations quickly.
-
-LANGUAGE INSTRUCTION: Respond in {response_language}."""),
-            ("user", """{conversation_history}
-
-Current message: {query}
-
-Respond naturally. Either ask a follow-up question OR mark as ASSESSMENT_COMPLETE.""")
-        ])
+        self.assessment_prompt = _SYMPTOM_ASSESSMENT_PROMPT
         
-        self.chain = self.assessment_prompt | self.llm | StrOutputParser()
+        self.chain = self.assessment_prompt | self.llm | _STR_PARSER
     
     def run(self, query: str, conversation_history: str = "", response_language: str = "English") -> Dict[str, Any]:
         """
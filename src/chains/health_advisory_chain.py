@@ -1,3 +1,4 @@
+import asyncio
 import os
 import requests
 import time
@@ -6,6 +7,27 @@ from datetime import datetime
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
+# The prompt and output parser are stateless; build them once at import
+# rather than in every chain constructor
+_STR_PARSER = StrOutputParser()
+
+_SUMMARIZE_PROMPT = ChatPromptTemplate.from_template(
+    """You are a public health alert system.
+            
+            User Query: {user_input}
+            
+            Top Health Headlines (India):
+            {headlines}
+            
+            Based on the above headlines, provide a concise summary or answer the user's specific question.
+            If the headlines are relevant to the query (e.g., "dengue news"), prioritize those.
+            If the query is general ("any alerts?"), summarize the top 3 most critical ones.
+            
+            Format clearly with bold text for headlines and emojis like 🚨, 🏥, 🦠.
+    """
+)
+
+
 class HealthAdvisoryChain:
     """Fetches real-time health news and alerts using NewsAPI client with strict medical filtering."""
     
@@ -67,22 +89,8 @@ class HealthAdvisoryChain:
             'real estate', 'property', 'housing', 'construction'
         ]
         
-        self.summarize_prompt = ChatPromptTemplate.from_template(
-            """You are a public health alert system.
-            
-            User Query: {user_input}
-            
-            Top Health Headlines (India):
-            {headlines}
-            
-            Based on the above headlines, provide a concise summary or answer the user's specific question.
-            If the headlines are relevant to the query (e.g., "dengue news"), prioritize those.
-            If the query is general ("any alerts?"), summarize the top 3 most critical ones.
-            
-            Format clearly with bold text for headlines and emojis like 🚨, 🏥, 🦠.
-            """
-        )
-        self.chain = self.summarize_prompt | llm | StrOutputParser()
+        self.summarize_prompt = _SUMMARIZE_PROMPT
+        self.chain = self.summarize_prompt | llm | _STR_PARSER
 
     def _is_medical_article(self, article: Dict[str, Any]) -> bool:
         """Strict filter to determine if article is truly medical/health related."""
@@ -265,15 +273,40 @@ class HealthAdvisoryChain:
         """Execute the chain."""
         articles = self.fetch_headlines()
         
-        # Format for LLM
-        headlines_text = ""
-        for a in articles:
-            source = a.get('source', {}).get('name', 'Unknown')
-            title = a.get('title', 'No Title')
-            desc = a.get('description', '')
-            headlines_text += f"- {title} (Source: {source})\n  Context: {desc}\n\n"
-        
         return self.chain.invoke({
             "user_input": user_input,
-            "headlines": headlines_text
+            "headlines": self._format_headlines(articles)
         })
+
+    async def arun(self, user_input: str) -> str:
+        """Async variant of run(); the blocking headline fetch runs in a worker thread."""
+        articles = await asyncio.to_thread(self.fetch_headlines)
+        
+        return await self.chain.ainvoke({
+            "user_input": user_input,
+            "headlines": self._format_headlines(articles)
+        })
+
+    async def arun_many(self, user_inputs: List[str]) -> List[str]:
+        """
+        Answer several queries against one headline fetch.
+        
+        The headlines are fetched once and the LLM calls run concurrently,
+        so N queries cost one fetch plus the slowest LLM call.
+        """
+        articles = await asyncio.to_thread(self.fetch_headlines)
+        headlines_text = self._format_headlines(articles)
+        
+        return await asyncio.gather(*[
+            self.chain.ainvoke({"user_input": user_input, "headlines": headlines_text})
+            for user_input in user_inputs
+        ])
+
+    @staticmethod
+    def _format_headlines(articles: List[Dict[str, Any]]) -> str:
+        """Format articles for the LLM prompt"""
+        return "".join(
+            f"- {a.get('title', 'No Title')} (Source: {a.get('source', {}).get('name', 'Unknown')})\n"
+            f"  Context: {a.get('description', '')}\n\n"
+            for a in articles
+        )
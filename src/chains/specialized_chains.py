@@ -2,9 +2,63 @@
 Discharge Simplification Chain - The core of the system
 """
 
-from typing import Dict, Any
+import copy
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from cachetools import LRUCache
+from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from ..schemas import DischargeOutputSchema
+from ..prompts import (
+    DISCHARGE_SIMPLIFIER_BATCH_USER_PROMPT,
+    DISCHARGE_SIMPLIFIER_SYSTEM_PROMPT,
+    DISCHARGE_SIMPLIFIER_USER_PROMPT,
+    PATIENT_EDUCATION_SYSTEM_PROMPT,
+    PATIENT_EDUCATION_USER_PROMPT,
+)
+from ..schemas import DischargeBatchOutputSchema, DischargeOutputSchema
+
+logger = logging.getLogger(__name__)
+
+
+# Prompt templates are constants; parse them once at import rather than in
+# every chain constructor
+_DISCHARGE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", DISCHARGE_SIMPLIFIER_SYSTEM_PROMPT),
+    ("user", DISCHARGE_SIMPLIFIER_USER_PROMPT)
+])
+
+_DISCHARGE_BATCH_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", DISCHARGE_SIMPLIFIER_SYSTEM_PROMPT),
+    ("user", DISCHARGE_SIMPLIFIER_BATCH_USER_PROMPT)
+])
+
+_EDUCATION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", PATIENT_EDUCATION_SYSTEM_PROMPT),
+    ("user", PATIENT_EDUCATION_USER_PROMPT)
+])
+
+
+# Input-token budget for one batched simplification call. Each document also
+# costs roughly a thousand output tokens, so this stays well below the
+# model's context window.
+BATCH_INPUT_TOKEN_BUDGET = 12_000
+
+
+@lru_cache(maxsize=1)
+def _token_encoding():
+    import tiktoken
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _estimate_tokens(text: str) -> int:
+    """Token count for batching decisions; ~4 chars/token if tiktoken is unavailable"""
+    try:
+        return len(_token_encoding().encode(text))
+    except Exception:
+        return len(text) // 4 + 1
 
 
 class DischargeSimplifierChain:
@@ -15,86 +69,21 @@ class DischargeSimplifierChain:
     This is the PRIMARY agent in the system.
     """
     
+    __slots__ = ('llm', 'prompt', 'chain', 'batch_chain', '_cache', '_cache_lock')
+    
     def __init__(self, llm):
         self.llm = llm
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert Medical Discharge Instruction Simplifier. 
-Your goal is to transform complex clinical discharge notes into a clear, safe, and actionable guide for the patient.
-
-**INPUT DATA:**
-- Use the provided discharge note text.
-- Incorporate general medical knowledge from public care instructions (CDC/MedlinePlus equivalent).
-
-**OUTPUT REQUIREMENTS (Strict JSON Schema):**
-
-1. **simplified_summary** (REQUIRED):
-   - Write a plain-language summary at 6th-8th grade reading level
-   - Avoid medical jargon - use simple words
-   - Explain WHY they were admitted and WHAT happened
-   - Examples of simplification:
-     * "Edema" → "Swelling"
-     * "Utilize" → "Use"  
-     * "Ambulate" → "Walk"
-     * "Hypertension" → "High blood pressure"
-
-2. **action_plan** (REQUIRED):
-   - Break down by specific timeframes: "Day 1 (Today)", "Day 2", "Week 1", "Week 2", etc.
-   - Each day should have:
-     * **tasks**: Specific, clear actions (e.g., "Take 1 blue pill with breakfast", "Change bandage at 8 PM", "Walk for 10 minutes")
-     * **medications**: List of medications for that timeframe
-   - Be VERY specific with times and quantities
-
-3. **danger_signs** (REQUIRED):
-   - List immediate "Red Flags" that require calling doctor/911
-   - Be specific (e.g., "Fever over 101°F", "Chest pain", "Difficulty breathing")
-   - Include "Call 911 if you experience any of these"
-
-4. **medication_list** (REQUIRED):
-   - Format: "Name - Purpose - Usage"
-   - Example: "Metformin - For blood sugar - Take 1 pill with breakfast and dinner"
-   - Include ALL medications mentioned in discharge notes
-
-5. **wound_care** (OPTIONAL):
-   - Specific wound care instructions if applicable
-   - Include frequency and technique
-
-6. **activity_restrictions** (OPTIONAL):
-   - What they CANNOT do
-   - Examples: "No lifting over 5 lbs", "No driving for 2 weeks"
-
-7. **follow_up_schedule** (REQUIRED):
-   - Who to see, when, and why
-   - Format: 
-     * specialist: "Cardiologist", "Primary Care Doctor"
-     * when: "Within 1 week", "In 2 weeks"
-     * purpose: "Check heart function", "Remove stitches"
-
-8. **lifestyle_changes** (REQUIRED):
-   - Diet modifications, exercise, smoking cessation, etc.
-   - Be specific and actionable
-
-9. **citations** (REQUIRED):
-   - Add links to trusted public sources relevant to their condition
-   - Examples: "MedlinePlus: Heart Failure Care", "CDC: Diabetes Management"
-
-**TONE:**
-- Empathetic, clear, and directive
-- Use "you" language (e.g., "You should take...")
-- Be encouraging but realistic
-
-**SAFETY:**
-- If critical values or severe conditions are mentioned, highlight them in danger signs
-- Do NOT make up medications not in the text
-- If information is missing, say "Ask your doctor about..."
-
-**READABILITY:**
-- Target 6th-8th grade reading level (Flesch-Kincaid)
-- Short sentences (under 20 words)
-- Active voice
-- Common words only
-"""),
-            ("user", "Here are the discharge instructions/medical notes:\n\n{input_text}")
-        ])
+        self.prompt = _DISCHARGE_PROMPT
+        # Structured output for strict schema validation; binding the schema
+        # once here avoids rebuilding the tool definition on every call
+        self.chain = self.prompt | self.llm.with_structured_output(DischargeOutputSchema)
+        self.batch_chain = _DISCHARGE_BATCH_PROMPT | self.llm.with_structured_output(
+            DischargeBatchOutputSchema
+        )
+        # Reprocessed documents (retries, standard templates) are served from
+        # a bounded cache keyed by a digest of the text
+        self._cache = LRUCache(maxsize=256)
+        self._cache_lock = threading.Lock()
     
     def run(self, document_text: str) -> DischargeOutputSchema:
         """
@@ -106,21 +95,186 @@ Your goal is to transform complex clinical discharge notes into a clear, safe, a
         Returns:
             DischargeOutputSchema with all required fields
         """
-        print(f"      → DischargeSimplifier: Processing {len(document_text)} chars of text...")
+        logger.debug("DischargeSimplifier: Processing %d chars of text...", len(document_text))
+        
+        key = self._cache_key(document_text)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            result = self.chain.invoke({"input_text": document_text})
+            self._log_result(result)
+            self._cache_put(key, result)
+            return result
+        except Exception as e:
+            logger.error("DischargeSimplifier failed: %s", e)
+            raise e
+    
+    async def arun(self, document_text: str) -> DischargeOutputSchema:
+        """
+        Async variant of run(); awaits the LLM instead of blocking a thread.
+        
+        Args:
+            document_text: Raw discharge note text
+            
+        Returns:
+            DischargeOutputSchema with all required fields
+        """
+        logger.debug("DischargeSimplifier: Processing %d chars of text...", len(document_text))
         
-        # Use structured output for strict schema validation
-        structured_llm = self.llm.with_structured_output(DischargeOutputSchema)
-        chain = self.prompt | structured_llm
+        key = self._cache_key(document_text)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         
         try:
-            result = chain.invoke({"input_text": document_text})
-            print(f"      ← Simplification complete. Summary length: {len(result.simplified_summary)}")
-            print(f"      ← Action plan has {len(result.action_plan)} days")
-            print(f"      ← {len(result.danger_signs)} danger signs identified")
+            result = await self.chain.ainvoke({"input_text": document_text})
+            self._log_result(result)
+            self._cache_put(key, result)
             return result
         except Exception as e:
-            print(f"      ❌ DischargeSimplifier failed: {e}")
+            logger.error("DischargeSimplifier failed: %s", e)
             raise e
+    
+    async def abatch(
+        self,
+        document_texts: List[str],
+        max_concurrency: int = 8
+    ) -> List[DischargeOutputSchema]:
+        """
+        Simplify many discharge documents concurrently.
+        
+        Args:
+            document_texts: Raw discharge note texts
+            max_concurrency: Maximum LLM calls in flight (provider rate limits)
+            
+        Returns:
+            List of DischargeOutputSchema, aligned with document_texts
+        """
+        keys = [self._cache_key(text) for text in document_texts]
+        results: List[Optional[DischargeOutputSchema]] = [self._cache_get(k) for k in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        
+        if missing:
+            fresh = await self.chain.abatch(
+                [{"input_text": document_texts[i]} for i in missing],
+                config={"max_concurrency": max_concurrency}
+            )
+            for i, result in zip(missing, fresh):
+                self._cache_put(keys[i], result)
+                results[i] = result
+        return results
+    
+    def run_many(
+        self,
+        document_texts: List[str],
+        batch_size: int = 3
+    ) -> List[DischargeOutputSchema]:
+        """
+        Simplify many short discharge documents, packing several per LLM call.
+        
+        Batches hold up to batch_size documents and are cut early when their
+        estimated input tokens would exceed BATCH_INPUT_TOKEN_BUDGET. A batch
+        whose response fails validation or has the wrong number of results
+        is retried one document at a time.
+        
+        Args:
+            document_texts: Raw discharge note texts
+            batch_size: Maximum documents per LLM call
+            
+        Returns:
+            List of DischargeOutputSchema, aligned with document_texts
+        """
+        keys = [self._cache_key(text) for text in document_texts]
+        results: List[Optional[DischargeOutputSchema]] = [self._cache_get(k) for k in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        
+        for batch in self._plan_batches(document_texts, missing, batch_size):
+            if len(batch) > 1:
+                outputs = self._run_batch([document_texts[i] for i in batch])
+                if outputs is not None:
+                    for i, result in zip(batch, outputs):
+                        self._cache_put(keys[i], result)
+                        results[i] = result
+                    continue
+            
+            for i in batch:
+                results[i] = self.run(document_texts[i])
+        return results
+    
+    @staticmethod
+    def _plan_batches(
+        document_texts: List[str],
+        indices: List[int],
+        batch_size: int
+    ) -> List[List[int]]:
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for i in indices:
+            tokens = _estimate_tokens(document_texts[i])
+            if current and (
+                len(current) >= batch_size
+                or current_tokens + tokens > BATCH_INPUT_TOKEN_BUDGET
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _run_batch(self, document_texts: List[str]) -> Optional[List[DischargeOutputSchema]]:
+        """One LLM call for several documents; None means fall back to per-document runs"""
+        joined = "\n\n".join(
+            f"---DOC {n}---\n{text}" for n, text in enumerate(document_texts, 1)
+        )
+        try:
+            output = self.batch_chain.invoke(
+                {"input_text": joined, "doc_count": len(document_texts)}
+            )
+        except Exception as e:
+            logger.warning("Batched simplification failed, retrying per document: %s", e)
+            return None
+        
+        if len(output.results) != len(document_texts):
+            logger.warning(
+                "Batched simplification returned %d results for %d documents, "
+                "retrying per document",
+                len(output.results), len(document_texts),
+            )
+            return None
+        for result in output.results:
+            self._log_result(result)
+        return output.results
+    
+    @staticmethod
+    def _cache_key(document_text: str) -> bytes:
+        return hashlib.blake2b(document_text.encode(), digest_size=16).digest()
+    
+    def _cache_get(self, key: bytes) -> Optional[DischargeOutputSchema]:
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        # Callers may edit the result, so hand out copies of the cached model
+        return copy.deepcopy(cached) if cached is not None else None
+    
+    def _cache_put(self, key: bytes, result: DischargeOutputSchema) -> None:
+        with self._cache_lock:
+            self._cache[key] = copy.deepcopy(result)
+    
+    @staticmethod
+    def _log_result(result: DischargeOutputSchema) -> None:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Simplification complete. Summary length: %d\n"
+                "  Action plan has %d days\n"
+                "  %d danger signs identified",
+                len(result.simplified_summary),
+                len(result.action_plan),
+                len(result.danger_signs),
+            )
 
 
 class PatientEducationChain:
@@ -129,40 +283,19 @@ class PatientEducationChain:
     Replacement for the old Yoga/Exercise recommendation feature.
     """
     
+    __slots__ = ('llm', 'prompt', 'chain')
+    
     def __init__(self, llm):
         self.llm = llm
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a Patient Education Expert.
-Your goal is to find the best Search Queries to find helpful RECOVERY and REHABILITATION videos on YouTube for a patient.
-
-**INPUT:**
-- Patient's condition or procedure (e.g., "Total Knee Replacement", "Heart Failure", "Type 2 Diabetes")
-
-**OUTPUT requirements (JSON):**
-1. **search_queries**: Generate 3-5 specific, safe search queries for YouTube.
-   - Focus on: "Exercises for...", "Diet for...", "Recovery tips for...", "What to expect after..."
-   - AVOID generic "Yoga" unless specifically helpful for mobility.
-   - Example: ["Post-op knee exercises phase 1", "How to climb stairs after knee replacement", "Anti-inflammatory diet for knee pain"]
-
-2. **recovery_tips**: List 3 key quick tips for this condition.
-
-**JSON FORMAT:**
-{{
-    "search_queries": ["query1", "query2", "query3"],
-    "recovery_tips": ["tip1", "tip2", "tip3"]
-}}"""),
-            ("user", "Patient condition/context: {context}")
-        ])
+        self.prompt = _EDUCATION_PROMPT
+        self.chain = self.prompt | self.llm | JsonOutputParser()
         
     def run(self, context: str) -> Dict[str, Any]:
         """
         Generate video search queries for the condition.
         """
-        from langchain_core.output_parsers import JsonOutputParser
-        
-        chain = self.prompt | self.llm | JsonOutputParser()
         try:
-            return chain.invoke({"context": context})
+            return self.chain.invoke({"context": context})
         except Exception as e:
-            print(f"Error in PatientEducationChain: {e}")
+            logger.error("Error in PatientEducationChain: %s", e)
             return {"search_queries": [f"{context} recovery exercises", f"{context} diet tips"], "recovery_tips": []}
\ No newline at end of file
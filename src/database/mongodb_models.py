@@ -1,16 +1,29 @@
 # Database Models for MongoDB
-from datetime import datetime
+import json
+from datetime import datetime, timezone
 from typing import Optional, List, Any, Annotated
-from pydantic import BaseModel, Field, BeforeValidator, PlainSerializer
+from pydantic import BaseModel, ConfigDict, Field, BeforeValidator, PlainSerializer
 from bson import ObjectId
+from bson.errors import InvalidId
+
+def _utcnow() -> datetime:
+    """Timezone-aware UTC timestamp (datetime.utcnow is deprecated and naive)"""
+    return datetime.now(timezone.utc)
 
 def validate_object_id(v: Any) -> ObjectId:
     """Validate ObjectId"""
-    if isinstance(v, ObjectId):
+    # Exact type check first: documents loaded from MongoDB already hold
+    # ObjectId instances
+    if type(v) is ObjectId:
         return v
-    if ObjectId.is_valid(v):
+    # ObjectId(None) would mint a fresh id instead of failing
+    if v is None:
+        raise ValueError("Invalid ObjectId")
+    # Parse once; is_valid() followed by ObjectId() parsed the value twice
+    try:
         return ObjectId(v)
-    raise ValueError("Invalid ObjectId")
+    except (InvalidId, TypeError):
+        raise ValueError("Invalid ObjectId")
 
 # Annotated type for ObjectId with Pydantic v2
 PyObjectId = Annotated[
@@ -19,6 +32,31 @@ PyObjectId = Annotated[
     PlainSerializer(lambda x: str(x), return_type=str)
 ]
 
+def _coerce_string_list(v: Any) -> Any:
+    """Accept legacy string encodings: JSON lists/scalars or comma-separated text"""
+    if isinstance(v, str):
+        if not v.strip():
+            return []
+        try:
+            parsed = json.loads(v)
+        except ValueError:
+            return [item.strip() for item in v.split(",") if item.strip()]
+        if isinstance(parsed, list):
+            return parsed
+        # A single JSON-encoded scalar such as '"Penicillin"' or '42'
+        if isinstance(parsed, (str, int, float, bool)):
+            return [str(parsed)]
+        # null and objects carry no list; fail loudly rather than
+        # silently emptying allergies or medical history
+        raise ValueError(f"Cannot interpret {v!r} as a list of strings")
+    return v
+
+# List of strings stored as a native BSON array
+StringList = Annotated[List[str], BeforeValidator(_coerce_string_list)]
+
+# Shared by every document model: accept "_id" or "id", allow ObjectId fields
+_MONGO_MODEL_CONFIG = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
 
 class ConsentAgreement(BaseModel):
     """HIPAA consent tracking"""
@@ -36,15 +74,13 @@ class UserMongo(BaseModel):
     display_name_encrypted: Optional[str] = None
     photo_url: Optional[str] = None  # Not PHI, can be plain
     encryption_key_id: str  # Reference to encryption key
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
     last_login: Optional[datetime] = None
     mfa_enabled: bool = False
     consent_agreements: List[ConsentAgreement] = []
     blockchain_identity: Optional[str] = None  # Public key
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
+    model_config = _MONGO_MODEL_CONFIG
 
 
 class SessionMongo(BaseModel):
@@ -52,8 +88,8 @@ class SessionMongo(BaseModel):
     id: Optional[PyObjectId] = Field(default_factory=ObjectId, alias="_id")
     user_id: PyObjectId
     title_encrypted: str
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
     status: str = "active"  # "active", "archived"
     blockchain_session_hash: Optional[str] = None
     
@@ -64,9 +100,7 @@ class SessionMongo(BaseModel):
     last_intent: Optional[str] = None  # Track last detected intent
     context_summary: Optional[str] = None  # AI-generated summary for long conversations
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
+    model_config = _MONGO_MODEL_CONFIG
 
 
 class MessageMongo(BaseModel):
@@ -77,7 +111,7 @@ class MessageMongo(BaseModel):
     role: str  # "user", "assistant", "system"
     content_encrypted: str  # AES-256 encrypted
     intent: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
     ip_address_hashed: str  # SHA-256 for audit
     blockchain_tx_hash: Optional[str] = None
     
@@ -89,9 +123,7 @@ class MessageMongo(BaseModel):
     citations: List[str] = Field(default_factory=list)  # Track source citations
     audio_url: Optional[str] = None  # TTS audio if generated
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
+    model_config = _MONGO_MODEL_CONFIG
 
 
 class BlockchainProof(BaseModel):
@@ -107,16 +139,14 @@ class UserProfileMongo(BaseModel):
     user_id: PyObjectId
     age: Optional[int] = None
     gender: Optional[str] = None
-    medical_history: str = "[]"  # JSON string of conditions
-    allergies: str = "[]"         # JSON string of allergies
-    medications: str = "[]"       # JSON string of current medications
+    medical_history: StringList = Field(default_factory=list)  # Conditions
+    allergies: StringList = Field(default_factory=list)        # Allergies
+    medications: StringList = Field(default_factory=list)      # Current medications
     language_preference: str = "en"
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
+    model_config = _MONGO_MODEL_CONFIG
 
 
 class AuditLogMongo(BaseModel):
@@ -126,15 +156,13 @@ class AuditLogMongo(BaseModel):
     action: str  # "READ", "WRITE", "UPDATE", "DELETE", "LOGIN", "EXPORT"
     resource_type: str  # "message", "session", "profile"
     resource_id: Optional[PyObjectId] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
     ip_address_hashed: str
     user_agent: str
     result: str  # "success", "failure"
     blockchain_proof: Optional[BlockchainProof] = None
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
+    model_config = _MONGO_MODEL_CONFIG
 
 
 class EncryptionKey(BaseModel):
@@ -143,13 +171,11 @@ class EncryptionKey(BaseModel):
     key_id: str  # Unique identifier
     encrypted_key: str  # Encrypted with master key
     algorithm: str = "AES-256-GCM"
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
     rotated_at: Optional[datetime] = None
     status: str = "active"  # "active", "rotated", "revoked"
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
+    model_config = _MONGO_MODEL_CONFIG
 
 
 class BlockchainRecord(BaseModel):
@@ -159,10 +185,8 @@ class BlockchainRecord(BaseModel):
     data_hash: str  # SHA-256
     blockchain_tx_hash: str
     block_number: int
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
     verified: bool = False
     verification_attempts: int = 0
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
+    model_config = _MONGO_MODEL_CONFIG
@@ -1,4 +1,6 @@
 import logging
+import mmap
+import re
 from pathlib import Path
 from typing import List, Optional
 from langchain_core.documents import Document
@@ -6,6 +8,9 @@ from .loader import DocumentLoader
 
 logger = logging.getLogger(__name__)
 
+# Runs of three or more newlines, collapsed to one blank line by _clean_text
+_NEWLINE_RE = re.compile(r'\n{3,}')
+
 class DischargeLoader:
     """
     Specialized loader for Discharge Instructions.
@@ -14,6 +19,9 @@ class DischargeLoader:
     relevant to medical discharge summaries (e.g., handling specific formatting issues).
     """
     
+    # Plain-text formats are read directly instead of via LangChain loaders
+    PLAIN_TEXT_EXTENSIONS = {'.txt', '.md'}
+    
     @staticmethod
     def load_discharge_summary(file_path: Path) -> str:
         """
@@ -30,6 +38,9 @@ class DischargeLoader:
             
         logger.info(f"Loading discharge summary from: {file_path}")
         
+        if file_path.suffix.lower() in DischargeLoader.PLAIN_TEXT_EXTENSIONS:
+            return DischargeLoader._clean_text(DischargeLoader._read_text_file(file_path))
+        
         # Use existing DocumentLoader to handle file formats
         docs = DocumentLoader.load_document(file_path)
         
@@ -38,21 +49,34 @@ class DischargeLoader:
             return ""
             
         # Merge all pages into a single text block
-        full_text = "\n\n".join([doc.page_content for doc in docs])
+        full_text = "\n\n".join(doc.page_content for doc in docs)
         
         # Basic cleanup (this can be expanded for specific EMR formats)
         cleaned_text = DischargeLoader._clean_text(full_text)
         
         return cleaned_text
 
+    @staticmethod
+    def _read_text_file(file_path: Path) -> str:
+        """Read a UTF-8 text file through a read-only memory map."""
+        with open(file_path, 'rb') as f:
+            # mmap cannot map an empty file
+            if f.seek(0, 2) == 0:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Strict decode: a non-UTF-8 file raises, as TextLoader did
+                text = str(mm, 'utf-8')
+        # Universal-newline translation, as text-mode reads do, so CRLF files
+        # collapse blank lines in _clean_text like LF files
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
+
     @staticmethod
     def _clean_text(text: str) -> str:
         """Basic text cleanup."""
         # Replace multiple newlines with double newline
-        import re
-        
-        # Remove multiple newlines
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _NEWLINE_RE.sub('\n\n', text)
         
         # Remove common EMR headers/footers placeholders if found (very basic examples)
         # text = text.replace("Page [of]", "") 
@@ -3,12 +3,18 @@ Image-based Document Extraction using OpenAI Vision (GPT-4o)
 Integrated from medi.mate project for prescription and discharge document processing
 """
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from typing import Dict, Any, Optional, List, Union
 from pathlib import Path
+import asyncio
+import copy
+import hashlib
+from functools import lru_cache
 import json
+import threading
 import time
 import os
+from cachetools import LRUCache
 from PIL import Image
 import base64
 from io import BytesIO
@@ -18,71 +24,168 @@ from ..config import HealthcareConfig
 
 logger = logging.getLogger(__name__)
 
+# orjson is optional; its decode errors subclass ValueError, as json's do
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-class ImageDocumentExtractor:
+# JPEG quality for images re-encoded before upload
+JPEG_QUALITY = 85
+
+# Longest side sent to the Vision API. The model downsamples larger images
+# anyway, so extra pixels only add upload time and billed image tokens.
+MAX_IMAGE_DIM = 1568
+
+# Parsed extraction results keyed by (model, prompt, image) digest. Shared by
+# all extractor instances, since the helper functions below build a new one
+# per call and re-uploaded prescriptions should not pay for a second
+# vision round-trip.
+_RESULT_CACHE: LRUCache = LRUCache(maxsize=128)
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def _result_cache_key(model: str, prompt: str, image_data: str) -> str:
+    digest = hashlib.sha256()
+    for part in (model, prompt, image_data):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _encode_jpeg(image: Image.Image) -> str:
+    # Base64 output is pure ASCII, and the ascii codec decodes it faster
+    # than utf-8. Optimized Huffman tables shrink the upload at no quality
+    # cost; JPEG has no alpha channel, so RGBA/P images are flattened first.
+    buffer = BytesIO()
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    image.save(buffer, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+    return base64.b64encode(buffer.getbuffer()).decode('ascii')
+
+
+def _encode_image_bytes(image_bytes: bytes) -> str:
+    """Encode an uploaded image, re-encoding it only when it needs downscaling"""
+    try:
+        # Image.open only parses the header, so small images cost nothing here
+        with Image.open(BytesIO(image_bytes)) as image:
+            if max(image.size) > MAX_IMAGE_DIM:
+                # thumbnail() lets the JPEG decoder skip to a reduced scale
+                image.thumbnail((MAX_IMAGE_DIM, MAX_IMAGE_DIM), Image.LANCZOS)
+                return _encode_jpeg(image)
+    except Exception as e:
+        logger.debug(f"Could not inspect image for downscaling: {e}")
+    return base64.b64encode(image_bytes).decode('ascii')
+
+
+# Encoded uploads, so running several extraction prompts over one document
+# reads, downscales and base64-encodes it once. Entries are multi-megabyte
+# strings, hence the small bound.
+ENCODE_CACHE_SIZE = 16
+_ENCODED_BYTES: LRUCache = LRUCache(maxsize=ENCODE_CACHE_SIZE)
+_ENCODED_BYTES_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=ENCODE_CACHE_SIZE)
+def _encode_file(path_str: str, mtime_ns: int, size: int) -> str:
+    with open(path_str, 'rb') as f:
+        return _encode_image_bytes(f.read())
+
+
+def _cache_get(key: str) -> Optional[Dict[str, Any]]:
+    with _RESULT_CACHE_LOCK:
+        cached = _RESULT_CACHE.get(key)
+    if cached is not None:
+        logger.info("Serving extraction from cache")
+        return copy.deepcopy(cached)
+    return None
+
+
+def _cache_put(key: str, result: Dict[str, Any]) -> None:
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[key] = copy.deepcopy(result)
+
+
+def _parse_json_reply(text: str) -> Optional[Dict[str, Any]]:
+    """Parse the model's JSON reply (JSON mode, so no markdown fences)"""
+    logger.debug(f"Raw response: {text[:500]}...")
+    
+    try:
+        result = _json_loads(text)
+    except ValueError as e:
+        logger.error(f"Failed to parse JSON response: {e}")
+        logger.error(f"Response text: {text}")
+        return None
+    
+    logger.info("Successfully extracted data from image")
+    return result
+
+
+def _read_pdf_text(path_obj: Path, max_pages: int = 3) -> str:
     """
-    Extracts structured data from medical documents (prescriptions, discharge summaries)
-    using OpenAI Vision API (GPT-4o) with OCR capabilities.
+    Text of the first pages of a PDF.
     
-    Features:
-    - Supports PDF and image files (JPG, PNG)
-    - Handles handwritten and printed text
-    - Extracts structured medical information
-    - Returns JSON-formatted data
+    Uses pypdfium2 (native PDFium parser) when installed, which is several
+    times faster than PyPDF2's pure-Python page parsing; PyPDF2 remains the
+    fallback. Raises ImportError if neither is available.
     """
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
     
-    def __init__(self, config: Optional[HealthcareConfig] = None):
-        """
-        Initialize the extractor with OpenAI API.
-        
-        Args:
-            config: HealthcareConfig instance (optional, uses env vars if not provided)
-        """
-        self.config = config or HealthcareConfig(skip_rag=True)
-        
-        # Get API key from environment
-        api_key = os.getenv("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY_1")
-        
-        if not api_key:
-            logger.warning("OpenAI API Key not found. Image extraction will not work.")
-            self.client = None
-        else:
-            self.client = OpenAI(api_key=api_key)
-            # Use GPT-4o-mini for vision (cheaper and faster than GPT-4o)
-            self.model = os.getenv("OPENAI_VISION_MODEL", "gpt-4o-mini")
-            logger.info(f"Initialized OpenAI Vision model: {self.model}")
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(str(path_obj))
+        try:
+            parts = []
+            for i in range(min(len(pdf), max_pages)):
+                textpage = pdf[i].get_textpage()
+                parts.append(textpage.get_text_range())
+                textpage.close()
+            return "\n".join(parts)
+        finally:
+            pdf.close()
     
-    def extract_prescription_data(self, file_input: Union[str, Path, Image.Image, bytes]) -> Optional[Dict[str, Any]]:
-        """
-        Extract prescription information from image or PDF.
-        
-        Args:
-            file_input: File path, PIL Image, or bytes
-            
-        Returns:
-            Dict with extracted prescription data:
-            {
-                "date": "Date of prescription",
-                "doctor": "Doctor name",
-                "patient": "Patient name",
-                "medicines": [
-                    {
-                        "name": "Medicine name",
-                        "dosage": "Dosage amount",
-                        "frequency": "How often (e.g., 1-0-1, twice daily)",
-                        "timing": {
-                            "morning": true/false,
-                            "afternoon": true/false,
-                            "night": true/false,
-                            "instruction": "Before/After meal"
-                        },
-                        "duration": "Duration (e.g., 7 days)"
-                    }
-                ],
-                "notes": "Special instructions"
-            }
-        """
-        prompt = """
+    import PyPDF2
+    with open(path_obj, 'rb') as pdf_file:
+        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        return "".join(page.extract_text() for page in pdf_reader.pages[:max_pages])
+
+
+def _is_blank(value: Any) -> bool:
+    return value is None or value == "" or value == "-" or value == [] or value == {}
+
+
+def _merge_page_results(results: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    Combine per-page extractions of one document.
+    
+    Lists are concatenated without duplicates, nested objects are filled in
+    field by field, and scalars keep the first non-blank value.
+    """
+    merged: Dict[str, Any] = {}
+    for page in results:
+        if not page:
+            continue
+        for key, value in page.items():
+            current = merged.get(key)
+            if isinstance(current, list) and isinstance(value, list):
+                current.extend(item for item in value if item not in current)
+            elif isinstance(current, dict) and isinstance(value, dict):
+                for field, field_value in value.items():
+                    if _is_blank(current.get(field)):
+                        current[field] = field_value
+            elif _is_blank(current):
+                merged[key] = value
+    return merged or None
+
+
+# =============================================================================
+# Extraction prompts
+# =============================================================================
+
+_PRESCRIPTION_PROMPT = """
         You are an expert medical assistant specialized in reading prescriptions.
         Analyze this prescription image and extract ALL information in JSON format.
         
@@ -126,18 +229,8 @@ class ImageDocumentExtractor:
         If a field is not clearly visible, use "-" or null.
         Return ONLY valid JSON, no markdown formatting.
         """
-        
-        return self._extract_with_openai(file_input, prompt)
-    
-    def extract_discharge_summary(self, file_input: Union[str, Path, Image.Image, bytes]) -> Optional[Dict[str, Any]]:
-        """
-        Extract discharge summary information from document.
-        
-        Returns:
-            Dict with discharge summary data including diagnosis, procedures,
-            medications, follow-up instructions, etc.
-        """
-        prompt = """
+
+_DISCHARGE_SUMMARY_PROMPT = """
         You are an expert medical assistant. Analyze this discharge summary and extract information in JSON format.
         
         {
@@ -176,14 +269,8 @@ class ImageDocumentExtractor:
         Extract ALL visible information. If a field is missing, use "-" or empty array.
         Return ONLY valid JSON.
         """
-        
-        return self._extract_with_openai(file_input, prompt)
-    
-    def extract_lab_report(self, file_input: Union[str, Path, Image.Image, bytes]) -> Optional[Dict[str, Any]]:
-        """
-        Extract lab test results from report images.
-        """
-        prompt = """
+
+_LAB_REPORT_PROMPT = """
         Extract all test results from this lab report in JSON format.
         
         {
@@ -203,14 +290,8 @@ class ImageDocumentExtractor:
         
         Return ONLY valid JSON.
         """
-        
-        return self._extract_with_openai(file_input, prompt)
-    
-    def extract_medical_certificate(self, file_input: Union[str, Path, Image.Image, bytes]) -> Optional[Dict[str, Any]]:
-        """
-        Extract information from medical certificates or fitness certificates.
-        """
-        prompt = """
+
+_MEDICAL_CERTIFICATE_PROMPT = """
         Extract information from this medical certificate in JSON format.
         
         {
@@ -227,8 +308,136 @@ class ImageDocumentExtractor:
         
         Return ONLY valid JSON.
         """
+
+
+# Output budget per extraction type. Decode time grows with output tokens,
+# so short documents get smaller caps; lab reports can list many tests.
+DEFAULT_MAX_TOKENS = 1500
+_PROMPT_MAX_TOKENS = {
+    _PRESCRIPTION_PROMPT: 900,
+    _DISCHARGE_SUMMARY_PROMPT: 1500,
+    _LAB_REPORT_PROMPT: 1200,
+    _MEDICAL_CERTIFICATE_PROMPT: 500,
+}
+
+
+class ImageDocumentExtractor:
+    """
+    Extracts structured data from medical documents (prescriptions, discharge summaries)
+    using OpenAI Vision API (GPT-4o) with OCR capabilities.
+    
+    Features:
+    - Supports PDF and image files (JPG, PNG)
+    - Handles handwritten and printed text
+    - Extracts structured medical information
+    - Returns JSON-formatted data
+    """
+    
+    def __init__(self, config: Optional[HealthcareConfig] = None):
+        """
+        Initialize the extractor with OpenAI API.
+        
+        Args:
+            config: HealthcareConfig instance (optional, uses env vars if not provided)
+        """
+        self.config = config or HealthcareConfig(skip_rag=True)
+        
+        # Get API key from environment
+        api_key = os.getenv("OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY_1")
+        
+        self._api_key = api_key
+        self._client: Optional[OpenAI] = None
+        self._async_client: Optional[AsyncOpenAI] = None
+        
+        # Use GPT-4o-mini for vision (cheaper and faster than GPT-4o)
+        self.model = os.getenv("OPENAI_VISION_MODEL", "gpt-4o-mini")
+        
+        if not api_key:
+            logger.warning("OpenAI API Key not found. Image extraction will not work.")
+        else:
+            logger.info(f"Configured OpenAI Vision model: {self.model}")
+    
+    # The SDK clients set up HTTP connection pools, so they are only built
+    # on first use; apps that import the extractor without calling it never
+    # pay for them. Both are None when no API key is configured.
+    
+    @property
+    def client(self) -> Optional[OpenAI]:
+        if self._client is None and self._api_key:
+            self._client = OpenAI(api_key=self._api_key)
+        return self._client
+    
+    @property
+    def async_client(self) -> Optional[AsyncOpenAI]:
+        if self._async_client is None and self._api_key:
+            self._async_client = AsyncOpenAI(api_key=self._api_key)
+        return self._async_client
+    
+    def extract_prescription_data(self, file_input: Union[str, Path, Image.Image, bytes]) -> Optional[Dict[str, Any]]:
+        """
+        Extract prescription information from image or PDF.
+        
+        Args:
+            file_input: File path, PIL Image, or bytes
+            
+        Returns:
+            Dict with extracted prescription data:
+            {
+                "date": "Date of prescription",
+                "doctor": "Doctor name",
+                "patient": "Patient name",
+                "medicines": [
+                    {
+                        "name": "Medicine name",
+                        "dosage": "Dosage amount",
+                        "frequency": "How often (e.g., 1-0-1, twice daily)",
+                        "timing": {
+                            "morning": true/false,
+                            "afternoon": true/false,
+                            "night": true/false,
+                            "instruction": "Before/After meal"
+                        },
+                        "duration": "Duration (e.g., 7 days)"
+                    }
+                ],
+                "notes": "Special instructions"
+            }
+        """
+        return self._extract_with_openai(file_input, _PRESCRIPTION_PROMPT)
+    
+    def extract_discharge_summary(self, file_input: Union[str, Path, Image.Image, bytes]) -> Optional[Dict[str, Any]]:
+        """
+        Extract discharge summary information from document.
         
-        return self._extract_with_openai(file_input, prompt)
+        Returns:
+            Dict with discharge summary data including diagnosis, procedures,
+            medications, follow-up instructions, etc.
+        """
+        return self._extract_with_openai(file_input, _DISCHARGE_SUMMARY_PROMPT)
+    
+    def extract_lab_report(self, file_input: Union[str, Path, Image.Image, bytes]) -> Optional[Dict[str, Any]]:
+        """
+        Extract lab test results from report images.
+        """
+        return self._extract_with_openai(file_input, _LAB_REPORT_PROMPT)
+    
+    def extract_medical_certificate(self, file_input: Union[str, Path, Image.Image, bytes]) -> Optional[Dict[str, Any]]:
+        """
+        Extract information from medical certificates or fitness certificates.
+        """
+        return self._extract_with_openai(file_input, _MEDICAL_CERTIFICATE_PROMPT)
+    
+    async def aextract_prescription_data(self, file_input: Union[str, Path, Image.Image, bytes]) -> Optional[Dict[str, Any]]:
+        """Async variant of extract_prescription_data."""
+        return await self._aextract_with_openai(file_input, _PRESCRIPTION_PROMPT)
+    
+    async def aextract_discharge_summary(self, file_input: Union[str, Path, Image.Image, bytes]) -> Optional[Dict[str, Any]]:
+        """Async variant of extract_discharge_summary."""
+        return await self._aextract_with_openai(file_input, _DISCHARGE_SUMMARY_PROMPT)
+    
+    async def aextract_lab_report(self, file_input: Union[str, Path, Image.Image, bytes]) -> Optional[Dict[str, Any]]:
+        """Async variant of extract_lab_report."""
+        return await self._aextract_with_openai(file_input, _LAB_REPORT_PROMPT)
     
     def _extract_with_openai(self, file_input: Union[str, Path, Image.Image, bytes], prompt: str) -> Optional[Dict[str, Any]]:
         """
@@ -246,106 +455,176 @@ class ImageDocumentExtractor:
             return None
         
         try:
-            # Convert input to base64 image
-            image_data = None
-            
-            if isinstance(file_input, (str, Path)):
+            if isinstance(file_input, (str, Path)) and Path(file_input).suffix.lower() == '.pdf':
                 path_obj = Path(file_input)
-                
-                if path_obj.suffix.lower() == '.pdf':
-                    # Try text extraction from PDF as fallback
-                    try:
-                        import PyPDF2
-                        logger.info("Extracting text from PDF...")
-                        with open(path_obj, 'rb') as pdf_file:
-                            pdf_reader = PyPDF2.PdfReader(pdf_file)
-                            text = ""
-                            for page in pdf_reader.pages[:3]:  # First 3 pages
-                                text += page.extract_text()
-                            
-                            if text.strip():
-                                logger.info(f"Extracted {len(text)} characters from PDF")
-                                # Return text for text-based extraction
-                                return {"_pdf_text": text.strip()}
-                            else:
-                                logger.error("No text could be extracted from PDF")
-                                return None
-                    except ImportError:
-                        logger.error("PyPDF2 not installed. Install with: pip install PyPDF2")
-                        return None
-                    except Exception as e:
-                        logger.error(f"PDF text extraction failed: {e}")
-                        return None
-                else:
-                    # Read image file
-                    with open(path_obj, 'rb') as f:
-                        image_bytes = f.read()
-                    image_data = base64.b64encode(image_bytes).decode('utf-8')
-                
-            elif isinstance(file_input, Image.Image):
-                # Convert PIL Image to bytes
-                buffer = BytesIO()
-                file_input.save(buffer, format='JPEG')
-                image_bytes = buffer.getvalue()
-                image_data = base64.b64encode(image_bytes).decode('utf-8')
-                
-            elif isinstance(file_input, bytes):
-                image_data = base64.b64encode(file_input).decode('utf-8')
-                
-            else:
-                logger.error(f"Unsupported file input type: {type(file_input)}")
-                return None
-            
-            # Call OpenAI Vision API
-            logger.info("Sending request to OpenAI Vision API...")
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": prompt
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{image_data}"
-                                }
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=1500,
-                temperature=0.1
-            )
-            
-            # Parse JSON from response
-            text = response.choices[0].message.content
-            logger.debug(f"Raw response: {text[:500]}...")
-            
-            # Clean up markdown code blocks if present
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0]
-            elif "```" in text:
-                text = text.split("```")[1].split("```")[0]
-            
-            # Parse JSON
-            result = json.loads(text.strip())
-            logger.info("Successfully extracted data from image")
+                pdf_result = self._extract_pdf_text(path_obj)
+                if pdf_result is not None:
+                    return pdf_result
+                # Scanned PDF without a text layer: read the rendered pages
+                results = [self._extract_image(page, prompt) for page in self._render_pdf_pages(path_obj)]
+                return _merge_page_results(results)
             
-            return result
+            image_data = self._encode_image(file_input)
+            if image_data is None:
+                return None
+            return self._extract_image(image_data, prompt)
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {e}")
-            logger.error(f"Response text: {text}")
+        except Exception as e:
+            logger.error(f"Extraction failed: {e}", exc_info=True)
+            return None
+    
+    async def _aextract_with_openai(self, file_input: Union[str, Path, Image.Image, bytes], prompt: str) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of _extract_with_openai.
+        
+        File reads, PDF parsing and encoding run in worker threads; the pages
+        of a scanned PDF are sent to the Vision API concurrently, so a
+        multi-page document costs about one round-trip instead of one per page.
+        """
+        if not self.async_client:
+            logger.error("OpenAI client not initialized. Check API key.")
             return None
+        
+        try:
+            if isinstance(file_input, (str, Path)) and Path(file_input).suffix.lower() == '.pdf':
+                path_obj = Path(file_input)
+                pdf_result = await asyncio.to_thread(self._extract_pdf_text, path_obj)
+                if pdf_result is not None:
+                    return pdf_result
+                pages = await asyncio.to_thread(self._render_pdf_pages, path_obj)
+                results = await asyncio.gather(*[self._aextract(page, prompt) for page in pages])
+                return _merge_page_results(results)
+            
+            image_data = await asyncio.to_thread(self._encode_image, file_input)
+            if image_data is None:
+                return None
+            return await self._aextract(image_data, prompt)
             
         except Exception as e:
             logger.error(f"Extraction failed: {e}", exc_info=True)
             return None
     
+    def _extract_pdf_text(self, path_obj: Path) -> Optional[Dict[str, Any]]:
+        """Text layer of the first pages as {"_pdf_text": ...}, or None if there is none"""
+        try:
+            logger.info("Extracting text from PDF...")
+            text = _read_pdf_text(path_obj)
+        except ImportError:
+            logger.error("No PDF library installed. Install with: pip install pypdfium2")
+            return None
+        except Exception as e:
+            logger.error(f"PDF text extraction failed: {e}")
+            return None
+        
+        if text.strip():
+            logger.info(f"Extracted {len(text)} characters from PDF")
+            # Return text for text-based extraction
+            return {"_pdf_text": text.strip()}
+        logger.warning("No text layer in PDF, falling back to page images")
+        return None
+    
+    def _render_pdf_pages(self, path_obj: Path, max_pages: int = 3) -> List[str]:
+        """Render the first pages of a PDF to base64 JPEGs for the Vision API"""
+        try:
+            import pypdfium2 as pdfium
+        except ImportError:
+            logger.error("pypdfium2 not installed. Install with: pip install pypdfium2")
+            return []
+        
+        pdf = pdfium.PdfDocument(str(path_obj))
+        try:
+            return [
+                self._encode_image(pdf[i].render(scale=2).to_pil())
+                for i in range(min(len(pdf), max_pages))
+            ]
+        finally:
+            pdf.close()
+    
+    def _encode_image(self, file_input: Union[str, Path, Image.Image, bytes]) -> Optional[str]:
+        """Base64-encode an image file, PIL Image or raw bytes, downscaled for upload"""
+        if isinstance(file_input, (str, Path)):
+            # Keyed on mtime and size so an overwritten file is re-read
+            stat = os.stat(file_input)
+            return _encode_file(os.fspath(file_input), stat.st_mtime_ns, stat.st_size)
+        
+        if isinstance(file_input, Image.Image):
+            image = file_input
+            if max(image.size) > MAX_IMAGE_DIM:
+                # thumbnail() resizes in place; leave the caller's image alone
+                image = image.copy()
+                image.thumbnail((MAX_IMAGE_DIM, MAX_IMAGE_DIM), Image.LANCZOS)
+            return _encode_jpeg(image)
+        
+        if isinstance(file_input, bytes):
+            key = hashlib.sha1(file_input).digest()
+            with _ENCODED_BYTES_LOCK:
+                image_data = _ENCODED_BYTES.get(key)
+            if image_data is None:
+                image_data = _encode_image_bytes(file_input)
+                with _ENCODED_BYTES_LOCK:
+                    _ENCODED_BYTES[key] = image_data
+            return image_data
+        
+        logger.error(f"Unsupported file input type: {type(file_input)}")
+        return None
+    
+    def _vision_request(self, image_data: str, prompt: str) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": prompt
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:image/jpeg;base64,{image_data}"
+                            }
+                        }
+                    ]
+                }
+            ],
+            "max_tokens": _PROMPT_MAX_TOKENS.get(prompt, DEFAULT_MAX_TOKENS),
+            "temperature": 0.1,
+            # JSON mode: the reply is always a bare JSON object
+            "response_format": {"type": "json_object"}
+        }
+    
+    def _extract_image(self, image_data: str, prompt: str) -> Optional[Dict[str, Any]]:
+        """Send one base64 image to the Vision API and parse the JSON reply"""
+        cache_key = _result_cache_key(self.model, prompt, image_data)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Call OpenAI Vision API
+        logger.info("Sending request to OpenAI Vision API...")
+        response = self.client.chat.completions.create(**self._vision_request(image_data, prompt))
+        
+        result = _parse_json_reply(response.choices[0].message.content)
+        if result is not None:
+            _cache_put(cache_key, result)
+        return result
+    
+    async def _aextract(self, image_data: str, prompt: str) -> Optional[Dict[str, Any]]:
+        """Async variant of _extract_image"""
+        cache_key = _result_cache_key(self.model, prompt, image_data)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        logger.info("Sending request to OpenAI Vision API...")
+        response = await self.async_client.chat.completions.create(**self._vision_request(image_data, prompt))
+        
+        result = _parse_json_reply(response.choices[0].message.content)
+        if result is not None:
+            _cache_put(cache_key, result)
+        return result
+    
     def extract_generic(self, file_input: Union[str, Path, Image.Image, bytes], custom_prompt: str) -> Optional[str]:
         """
         Extract information using a custom prompt.
@@ -363,16 +642,7 @@ class ImageDocumentExtractor:
         
         try:
             # Convert to base64 and call OpenAI
-            image_data = None
-            if isinstance(file_input, (str, Path)):
-                with open(file_input, 'rb') as f:
-                    image_data = base64.b64encode(f.read()).decode('utf-8')
-            elif isinstance(file_input, Image.Image):
-                buffer = BytesIO()
-                file_input.save(buffer, format='JPEG')
-                image_data = base64.b64encode(buffer.getvalue()).decode('utf-8')
-            elif isinstance(file_input, bytes):
-                image_data = base64.b64encode(file_input).decode('utf-8')
+            image_data = self._encode_image(file_input)
             
             response = self.client.chat.completions.create(
                 model=self.model,
@@ -14,12 +14,37 @@ from langchain_core.output_parsers import JsonOutputParser
 
 logger = logging.getLogger(__name__)
 
+_ANALYSIS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a medical document analyzer. Extract key information quickly and concisely.
+
+Extract ONLY the most important details:
+- Document type (Lab Report, Prescription, etc.)
+- Patient name (if mentioned)
+- Key test results or findings
+- Medications mentioned
+- Diagnoses
+
+Return JSON:
+{{
+    "document_type": "...",
+    "patient_name": "full name or null",
+    "findings": ["key finding 1", "key finding 2"],
+    "medications": ["med1", "med2"],
+    "diagnoses": ["condition1"],
+    "test_results": [{{"test": "Hemoglobin", "value": "10.2", "unit": "g/dL", "status": "Low"}}],
+    "summary": "One-line summary"
+}}"""),
+    ("user", "Analyze this medical document briefly:\n\n{text}")
+])
+
 
 class MedicalDocumentExtractor:
     """Extract and analyze medical documents"""
     
     def __init__(self, llm=None):
         self.llm = llm
+        # Compose the analysis pipeline once instead of on every document
+        self.chain = _ANALYSIS_PROMPT | llm | JsonOutputParser() if llm else None
         
     def extract_pdf_content(self, file_path: Path) -> Dict[str, Any]:
         """
@@ -77,32 +102,7 @@ class MedicalDocumentExtractor:
             import time
             
             def run_analysis():
-                prompt = ChatPromptTemplate.from_messages([
-                    ("system", """You are a medical document analyzer. Extract key information quickly and concisely.
-
-Extract ONLY the most important details:
-- Document type (Lab Report, Prescription, etc.)
-- Patient name (if mentioned)
-- Key test results or findings
-- Medications mentioned
-- Diagnoses
-
-Return JSON:
-{{
-    "document_type": "...",
-    "patient_name": "full name or null",
-    "findings": ["key finding 1", "key finding 2"],
-    "medications": ["med1", "med2"],
-    "diagnoses": ["condition1"],
-    "test_results": [{{"test": "Hemoglobin", "value": "10.2", "unit": "g/dL", "status": "Low"}}],
-    "summary": "One-line summary"
-}}"""),
-                    ("user", "Analyze this medical document briefly:\n\n{text}")
-                ])
-                
-                parser = JsonOutputParser()
-                chain = prompt | self.llm | parser
-                return chain.invoke({"text": text[:2000]})  # Reduced from 3000
+                return self.chain.invoke({"text": text[:2000]})  # Reduced from 3000
             
             # Run with 10 second timeout
             with ThreadPoolExecutor(max_workers=1) as executor:
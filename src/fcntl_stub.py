@@ -12,6 +12,15 @@ For production deployments, use Linux/WSL.
 import os
 import sys
 
+# Only the names the real fcntl module provides, so `from fcntl import *`
+# does not pull in the Win32 locking helpers below
+__all__ = [
+    'LOCK_SH', 'LOCK_EX', 'LOCK_NB', 'LOCK_UN',
+    'F_DUPFD', 'F_GETFD', 'F_SETFD', 'F_GETFL', 'F_SETFL',
+    'F_GETLK', 'F_SETLK', 'F_SETLKW', 'FD_CLOEXEC',
+    'fcntl', 'flock', 'lockf', 'ioctl',
+]
+
 # Windows-specific constants (matching Unix values for compatibility)
 LOCK_SH = 1  # Shared lock
 LOCK_EX = 2  # Exclusive lock
@@ -47,46 +56,118 @@ def fcntl(fd, cmd, arg=0):
     return 0
 
 
+# Win32 byte-range locking. msvcrt.locking() locks one byte at the current
+# position, has no shared mode, and in blocking mode polls once a second
+# before giving up after 10 tries. LockFileEx locks the whole file, supports
+# shared locks, blocks without polling and fails immediately for LOCK_NB.
+_LOCKFILE_FAIL_IMMEDIATELY = 0x1
+_LOCKFILE_EXCLUSIVE_LOCK = 0x2
+_ERROR_LOCK_VIOLATION = 33
+_WHOLE_FILE = 0xFFFFFFFF  # low/high DWORDs of the locked range length
+
+if sys.platform == 'win32':
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    class _OVERLAPPED(ctypes.Structure):
+        _fields_ = [
+            ('Internal', ctypes.c_void_p),
+            ('InternalHigh', ctypes.c_void_p),
+            ('Offset', wintypes.DWORD),
+            ('OffsetHigh', wintypes.DWORD),
+            ('hEvent', wintypes.HANDLE),
+        ]
+
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+
+    _LockFileEx = _kernel32.LockFileEx
+    _LockFileEx.argtypes = [
+        wintypes.HANDLE, wintypes.DWORD, wintypes.DWORD,
+        wintypes.DWORD, wintypes.DWORD, ctypes.POINTER(_OVERLAPPED),
+    ]
+    _LockFileEx.restype = wintypes.BOOL
+
+    _UnlockFileEx = _kernel32.UnlockFileEx
+    _UnlockFileEx.argtypes = [
+        wintypes.HANDLE, wintypes.DWORD,
+        wintypes.DWORD, wintypes.DWORD, ctypes.POINTER(_OVERLAPPED),
+    ]
+    _UnlockFileEx.restype = wintypes.BOOL
+
+    # Bound once so the lock/unlock path does no module attribute lookups
+    _get_osfhandle = msvcrt.get_osfhandle
+    _byref = ctypes.byref
+    _get_last_error = ctypes.get_last_error
+else:
+    msvcrt = None
+    _LockFileEx = None
+    _UnlockFileEx = None
+
+
+def _win32_flock(fd, operation):
+    """Lock or unlock the whole file with LockFileEx/UnlockFileEx."""
+    handle = _get_osfhandle(fd)
+    # A new zeroed struct (range starting at offset 0) is as cheap as copying
+    # a template, and the kernel may write to it during the call
+    overlapped = _OVERLAPPED()
+    
+    if operation & LOCK_UN:
+        ok = _UnlockFileEx(handle, 0, _WHOLE_FILE, _WHOLE_FILE, _byref(overlapped))
+    else:
+        flags = _LOCKFILE_EXCLUSIVE_LOCK if operation & LOCK_EX else 0
+        if operation & LOCK_NB:
+            flags |= _LOCKFILE_FAIL_IMMEDIATELY
+        ok = _LockFileEx(handle, flags, 0, _WHOLE_FILE, _WHOLE_FILE, _byref(overlapped))
+    
+    if not ok:
+        raise ctypes.WinError(_get_last_error())
+
+
 def flock(fd, operation):
     """
     Stub flock implementation for Windows.
     
-    Uses Windows file locking via msvcrt if available, otherwise no-op.
+    Uses LockFileEx when available, then msvcrt, otherwise no-op.
     """
-    try:
-        import msvcrt
-        
-        # Get file handle
-        if hasattr(fd, 'fileno'):
-            fd = fd.fileno()
-        
-        # Determine lock type
-        if operation & LOCK_UN:
-            # Unlock
-            try:
-                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
-            except (OSError, IOError):
-                pass  # Ignore unlock errors
-        elif operation & LOCK_EX:
-            # Exclusive lock
-            try:
-                if operation & LOCK_NB:
-                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
-                else:
-                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
-            except (OSError, IOError):
-                pass  # Ignore lock errors on Windows
-        elif operation & LOCK_SH:
-            # Shared lock (Windows doesn't distinguish, use exclusive)
-            try:
-                if operation & LOCK_NB:
-                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
-                else:
-                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
-            except (OSError, IOError):
-                pass
-    except ImportError:
-        pass  # msvcrt not available, skip locking
+    # Get file handle
+    if hasattr(fd, 'fileno'):
+        fd = fd.fileno()
+    
+    if _LockFileEx is not None:
+        try:
+            _win32_flock(fd, operation)
+            return
+        except OSError as e:
+            # Contention and unlock errors are ignored, as with msvcrt below
+            if operation & LOCK_UN or getattr(e, 'winerror', None) == _ERROR_LOCK_VIOLATION:
+                return
+            # Anything else (e.g. a handle LockFileEx rejects): try msvcrt
+    
+    _msvcrt_flock(fd, operation)
+
+
+def _msvcrt_flock(fd, operation):
+    """Single-byte msvcrt locking, the fallback when LockFileEx fails."""
+    if msvcrt is None:
+        return  # msvcrt not available, skip locking
+    
+    # Determine lock type
+    if operation & LOCK_UN:
+        # Unlock
+        try:
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        except (OSError, IOError):
+            pass  # Ignore unlock errors
+    elif operation & (LOCK_EX | LOCK_SH):
+        # Exclusive lock (msvcrt has no shared mode, so LOCK_SH is exclusive)
+        try:
+            if operation & LOCK_NB:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        except (OSError, IOError):
+            pass  # Ignore lock errors on Windows
 
 
 def lockf(fd, cmd, length=0, start=0, whence=0):
@@ -105,6 +186,7 @@ def ioctl(fd, request, arg=0, mutate_flag=True):
     return 0
 
 
-# Register this module as 'fcntl' in sys.modules if on Windows
-if sys.platform == 'win32':
+# Register this module as 'fcntl' in sys.modules if on Windows, without
+# replacing an fcntl that is already loaded (a real one, or this stub)
+if sys.platform == 'win32' and 'fcntl' not in sys.modules:
     sys.modules['fcntl'] = sys.modules[__name__]
@@ -5,26 +5,59 @@ This module provides stub implementations of grp functions that are
 required by gunicorn but not available on Windows.
 """
 
+from collections import namedtuple
+from functools import lru_cache
 
-class struct_group:
-    """Struct group for Windows compatibility."""
-    def __init__(self, gr_name='', gr_passwd='x', gr_gid=0, gr_mem=None):
-        self.gr_name = gr_name
-        self.gr_passwd = gr_passwd
-        self.gr_gid = gr_gid
-        self.gr_mem = gr_mem or []
 
+def _define_struct_group():
+    # Immutable like the real grp.struct_group (members as a tuple), so the
+    # memoized entries returned below cannot be edited by one caller for
+    # everyone else
+    class struct_group(namedtuple('struct_group', ['gr_name', 'gr_passwd', 'gr_gid', 'gr_mem'])):
+        """Struct group for Windows compatibility."""
+        __slots__ = ()
+        
+        def __new__(cls, gr_name='', gr_passwd='x', gr_gid=0, gr_mem=None):
+            return super().__new__(cls, gr_name, gr_passwd, gr_gid, tuple(gr_mem or ()))
+    
+    struct_group.__module__ = __name__
+    struct_group.__qualname__ = "struct_group"
+    return struct_group
 
+
+# Attributes built on first access (PEP 562); the result is stored in the
+# module globals, so later lookups skip __getattr__ entirely
+_LAZY_ATTRS = {
+    'struct_group': _define_struct_group,
+}
+
+
+def __getattr__(name):
+    factory = _LAZY_ATTRS.get(name)
+    if factory is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = globals()[name] = factory()
+    return value
+
+
+def _struct_group():
+    cls = globals().get('struct_group')
+    return cls if cls is not None else __getattr__('struct_group')
+
+
+@lru_cache(maxsize=None)
 def getgrgid(gid):
     """Get group database entry by GID."""
-    return struct_group(gr_name='Users', gr_gid=gid)
+    return _struct_group()(gr_name='Users', gr_gid=gid)
 
 
+@lru_cache(maxsize=None)
 def getgrnam(name):
     """Get group database entry by name."""
-    return struct_group(gr_name=name, gr_gid=0)
+    return _struct_group()(gr_name=name, gr_gid=0)
 
 
+@lru_cache(maxsize=None)
 def getgrall():
-    """Return list of all group database entries."""
-    return [getgrgid(0)]
+    """Return all group database entries (a tuple, as the result is shared)."""
+    return (getgrgid(0),)
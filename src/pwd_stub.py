@@ -6,43 +6,73 @@ required by gunicorn but not available on Windows.
 """
 
 import os
+from collections import namedtuple
+from functools import lru_cache
 
+# The Windows account does not change during the process, so the environment
+# is read once and every lookup below is memoized
+_USERNAME = os.environ.get('USERNAME', 'user')
+_USERPROFILE = os.environ.get('USERPROFILE', 'C:\\Users\\User')
 
-class struct_passwd:
-    """Struct passwd for Windows compatibility."""
-    def __init__(self, pw_name='', pw_passwd='x', pw_uid=0, pw_gid=0, 
-                 pw_gecos='', pw_dir='', pw_shell=''):
-        self.pw_name = pw_name
-        self.pw_passwd = pw_passwd
-        self.pw_uid = pw_uid
-        self.pw_gid = pw_gid
-        self.pw_gecos = pw_gecos
-        self.pw_dir = pw_dir
-        self.pw_shell = pw_shell
+
+def _define_struct_passwd():
+    # Immutable like the real pwd.struct_passwd, so the memoized entries
+    # returned below cannot be edited by one caller for everyone else
+    struct_passwd = namedtuple(
+        'struct_passwd',
+        ['pw_name', 'pw_passwd', 'pw_uid', 'pw_gid', 'pw_gecos', 'pw_dir', 'pw_shell'],
+        defaults=('', 'x', 0, 0, '', '', ''),
+        module=__name__,
+    )
+    struct_passwd.__doc__ = "Struct passwd for Windows compatibility."
+    return struct_passwd
+
+
+# Attributes built on first access (PEP 562); the result is stored in the
+# module globals, so later lookups skip __getattr__ entirely
+_LAZY_ATTRS = {
+    'struct_passwd': _define_struct_passwd,
+}
+
+
+def __getattr__(name):
+    factory = _LAZY_ATTRS.get(name)
+    if factory is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = globals()[name] = factory()
+    return value
+
+
+def _struct_passwd():
+    cls = globals().get('struct_passwd')
+    return cls if cls is not None else __getattr__('struct_passwd')
 
 
+@lru_cache(maxsize=None)
 def getpwuid(uid):
     """Get password database entry by UID."""
-    return struct_passwd(
-        pw_name=os.environ.get('USERNAME', 'user'),
+    return _struct_passwd()(
+        pw_name=_USERNAME,
         pw_uid=uid,
         pw_gid=0,
-        pw_dir=os.environ.get('USERPROFILE', 'C:\\Users\\User'),
+        pw_dir=_USERPROFILE,
         pw_shell='cmd.exe'
     )
 
 
+@lru_cache(maxsize=None)
 def getpwnam(name):
     """Get password database entry by name."""
-    return struct_passwd(
+    return _struct_passwd()(
         pw_name=name,
         pw_uid=os.getuid() if hasattr(os, 'getuid') else 0,
         pw_gid=0,
-        pw_dir=os.environ.get('USERPROFILE', 'C:\\Users\\User'),
+        pw_dir=_USERPROFILE,
         pw_shell='cmd.exe'
     )
 
 
+@lru_cache(maxsize=None)
 def getpwall():
-    """Return list of all password database entries."""
-    return [getpwuid(0)]
+    """Return all password database entries (a tuple, as the result is shared)."""
+    return (getpwuid(0),)
@@ -3,7 +3,7 @@ Data schemas for Discharge Simplification System
 """
 
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ActionPlanItem(BaseModel):
@@ -51,6 +51,68 @@ class FollowUpAppointment(BaseModel):
     )
 
 
+# Static example shown in the generated JSON schema; built once at import
+_DISCHARGE_OUTPUT_EXAMPLE = {
+    "simplified_summary": "You were in the hospital because your heart was not pumping blood well (heart failure). The doctors gave you medicine and monitored you for 3 days. You are now stable and can go home.",
+    "action_plan": [
+        {
+            "day": "Day 1 (Today)",
+            "tasks": [
+                "Take 1 blue pill (Furosemide) with breakfast",
+                "Weigh yourself in the morning",
+                "Rest - no heavy activity"
+            ],
+            "medications": ["Furosemide 40mg", "Lisinopril 10mg"]
+        },
+        {
+            "day": "Week 1",
+            "tasks": [
+                "Continue daily weighing",
+                "Walk for 10 minutes twice a day",
+                "Track your weight - call doctor if gain over 2 lbs"
+            ],
+            "medications": ["Furosemide 40mg", "Lisinopril 10mg"]
+        }
+    ],
+    "danger_signs": [
+        "Fever over 101°F",
+        "Chest pain or pressure",
+        "Difficulty breathing or shortness of breath",
+        "Swelling in legs gets worse",
+        "Weight gain of 2+ pounds in one day"
+    ],
+    "medication_list": [
+        "Furosemide (water pill) - Helps remove extra fluid - Take 1 pill every morning",
+        "Lisinopril - For blood pressure and heart - Take 1 pill every morning"
+    ],
+    "wound_care": None,
+    "activity_restrictions": "No heavy lifting over 10 pounds for 2 weeks. No strenuous exercise. Rest when tired.",
+    "follow_up_schedule": [
+        {
+            "specialist": "Cardiologist (Heart Doctor)",
+            "when": "Within 1 week",
+            "purpose": "Check how your heart is doing and adjust medications if needed"
+        },
+        {
+            "specialist": "Primary Care Doctor",
+            "when": "Within 2 weeks",
+            "purpose": "General checkup and review all medications"
+        }
+    ],
+    "lifestyle_changes": [
+        "Reduce salt - no more than 1 teaspoon per day",
+        "Drink less fluid - no more than 6 cups per day",
+        "Quit smoking if you smoke",
+        "Eat more fruits and vegetables"
+    ],
+    "citations": [
+        "MedlinePlus: Heart Failure",
+        "CDC: Heart Disease Prevention",
+        "American Heart Association: Living with Heart Failure"
+    ]
+}
+
+
 class DischargeOutputSchema(BaseModel):
     """
     Complete structured output for simplified discharge instructions.
@@ -123,65 +185,17 @@ class DischargeOutputSchema(BaseModel):
                     "Format: 'Source: Topic' (e.g., 'MedlinePlus: Heart Failure Care')"
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "simplified_summary": "You were in the hospital because your heart was not pumping blood well (heart failure). The doctors gave you medicine and monitored you for 3 days. You are now stable and can go home.",
-                "action_plan": [
-                    {
-                        "day": "Day 1 (Today)",
-                        "tasks": [
-                            "Take 1 blue pill (Furosemide) with breakfast",
-                            "Weigh yourself in the morning",
-                            "Rest - no heavy activity"
-                        ],
-                        "medications": ["Furosemide 40mg", "Lisinopril 10mg"]
-                    },
-                    {
-                        "day": "Week 1",
-                        "tasks": [
-                            "Continue daily weighing",
-                            "Walk for 10 minutes twice a day",
-                            "Track your weight - call doctor if gain over 2 lbs"
-                        ],
-                        "medications": ["Furosemide 40mg", "Lisinopril 10mg"]
-                    }
-                ],
-                "danger_signs": [
-                    "Fever over 101°F",
-                    "Chest pain or pressure",
-                    "Difficulty breathing or shortness of breath",
-                    "Swelling in legs gets worse",
-                    "Weight gain of 2+ pounds in one day"
-                ],
-                "medication_list": [
-                    "Furosemide (water pill) - Helps remove extra fluid - Take 1 pill every morning",
-                    "Lisinopril - For blood pressure and heart - Take 1 pill every morning"
-                ],
-                "wound_care": None,
-                "activity_restrictions": "No heavy lifting over 10 pounds for 2 weeks. No strenuous exercise. Rest when tired.",
-                "follow_up_schedule": [
-                    {
-                        "specialist": "Cardiologist (Heart Doctor)",
-                        "when": "Within 1 week",
-                        "purpose": "Check how your heart is doing and adjust medications if needed"
-                    },
-                    {
-                        "specialist": "Primary Care Doctor",
-                        "when": "Within 2 weeks",
-                        "purpose": "General checkup and review all medications"
-                    }
-                ],
-                "lifestyle_changes": [
-                    "Reduce salt - no more than 1 teaspoon per day",
-                    "Drink less fluid - no more than 6 cups per day",
-                    "Quit smoking if you smoke",
-                    "Eat more fruits and vegetables"
-                ],
-                "citations": [
-                    "MedlinePlus: Heart Failure",
-                    "CDC: Heart Disease Prevention",
-                    "American Heart Association: Living with Heart Failure"
-                ]
-            }
-        }
+    model_config = ConfigDict(
+        json_schema_extra={"example": _DISCHARGE_OUTPUT_EXAMPLE}
+    )
+
+
+class DischargeBatchOutputSchema(BaseModel):
+    """
+    Structured output for several discharge documents simplified in one call.
+    
+    results[i] corresponds to the i-th document in the request.
+    """
+    results: List[DischargeOutputSchema] = Field(
+        description="One simplified output per input document, in input order"
+    )
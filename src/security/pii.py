@@ -0,0 +1,102 @@
+"""
+Deterministic PII detection for discharge documents
+
+Shared by SafetyGuardrailChain (checked before the LLM safety call) and the
+discharge workflow's pre-flight check. Every pattern is backed by the identifier's own
+validation rule, so lab values, dates and times that happen to be digit runs
+of the right shape are not flagged.
+
+Note: stdlib only, so it can be used without loading LangChain.
+"""
+
+import re
+from typing import Callable, List, Optional, Tuple
+
+# US SSN: area 000/666/9xx, group 00 and serial 0000 are never issued
+_SSN_RE = re.compile(r'\b(?!000|666|9\d\d)\d{3}-(?!00)\d{2}-(?!0000)\d{4}\b')
+
+# Card numbers: 16 digits in groups of four, or 15 as 4-6-5 (Amex), with one
+# consistent separator (space, hyphen or none) - never across line breaks
+_CARD_RE = re.compile(
+    r'\b(?:\d{4}([ -]?)\d{4}\1\d{4}\1\d{4}|\d{4}([ -]?)\d{6}\2\d{5})\b'
+)
+
+# Aadhaar: 12 digits written as 4-4-4 with single spaces; the first digit is
+# never 0 or 1 and the last is a Verhoeff check digit
+_AADHAAR_RE = re.compile(r'\b[2-9]\d{3} \d{4} \d{4}\b')
+
+# Verhoeff dihedral-group multiplication and position permutation tables
+_VERHOEFF_D = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
+    (1, 2, 3, 4, 0, 6, 7, 8, 9, 5),
+    (2, 3, 4, 0, 1, 7, 8, 9, 5, 6),
+    (3, 4, 0, 1, 2, 8, 9, 5, 6, 7),
+    (4, 0, 1, 2, 3, 9, 5, 6, 7, 8),
+    (5, 9, 8, 7, 6, 0, 4, 3, 2, 1),
+    (6, 5, 9, 8, 7, 1, 0, 4, 3, 2),
+    (7, 6, 5, 9, 8, 2, 1, 0, 4, 3),
+    (8, 7, 6, 5, 9, 3, 2, 1, 0, 4),
+    (9, 8, 7, 6, 5, 4, 3, 2, 1, 0),
+)
+_VERHOEFF_P = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
+    (1, 5, 7, 6, 2, 8, 3, 0, 9, 4),
+    (5, 8, 0, 3, 7, 9, 6, 1, 4, 2),
+    (8, 9, 1, 6, 0, 4, 3, 5, 2, 7),
+    (9, 4, 5, 3, 1, 2, 6, 8, 7, 0),
+    (4, 2, 8, 6, 5, 7, 3, 9, 0, 1),
+    (2, 7, 9, 3, 8, 0, 6, 4, 1, 5),
+    (7, 0, 4, 6, 9, 1, 3, 2, 5, 8),
+)
+
+
+def _digits(number: str) -> List[int]:
+    return [int(c) for c in number if c.isdigit()]
+
+
+def luhn_valid(number: str) -> bool:
+    """Luhn checksum, used to drop card-shaped digit runs that are not cards"""
+    checksum = 0
+    for i, d in enumerate(reversed(_digits(number))):
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        checksum += d
+    return checksum % 10 == 0
+
+
+def verhoeff_valid(number: str) -> bool:
+    """Verhoeff checksum, the check digit scheme of Aadhaar numbers"""
+    c = 0
+    for i, d in enumerate(reversed(_digits(number))):
+        c = _VERHOEFF_D[c][_VERHOEFF_P[i % 8][d]]
+    return c == 0
+
+
+# (kind, human-readable label, pattern, checksum or None), in reporting order
+_PII_CHECKS: Tuple[Tuple[str, str, "re.Pattern[str]", Optional[Callable[[str], bool]]], ...] = (
+    ("ssn", "SSN", _SSN_RE, None),
+    ("credit_card", "credit card number", _CARD_RE, luhn_valid),
+    ("aadhaar", "Aadhaar number", _AADHAAR_RE, verhoeff_valid),
+)
+
+
+def find_pii(text: str) -> List[str]:
+    """Return the PII kinds (ssn, credit_card, aadhaar) found in text."""
+    found = []
+    for kind, _, pattern, checksum in _PII_CHECKS:
+        for match in pattern.finditer(text):
+            if checksum is None or checksum(match.group()):
+                found.append(kind)
+                break
+    return found
+
+
+def detect_pii(text: str) -> Optional[str]:
+    """Return the kind of PII found by regex (None if nothing matched)"""
+    for _, label, pattern, checksum in _PII_CHECKS:
+        for match in pattern.finditer(text):
+            if checksum is None or checksum(match.group()):
+                return label
+    return None
@@ -1,12 +1,71 @@
 import datetime
+import itertools
+import os
 from typing import List, Dict, Any
-import uuid
+
+# Event UIDs only need to be unique, not random: creation time, process id
+# and a process-wide counter cover concurrent gunicorn workers without an
+# os.urandom() call per event as uuid4() makes
+_uid_counter = itertools.count()
+
+# RFC 5545 TEXT escaping, applied in one str.translate pass per value
+_ICS_ESCAPE = str.maketrans({
+    "\\": "\\\\",
+    ";": "\\;",
+    ",": "\\,",
+    "\n": "\\n",
+})
+
+# RFC 5545 content lines are at most 75 octets; continuations start with a space
+_MAX_LINE_OCTETS = 75
+
+
+def _emit_folded(out: List[str], line: str) -> None:
+    """Append line to out, folded into 75-octet content lines."""
+    if line.isascii():
+        if len(line) <= _MAX_LINE_OCTETS:
+            out.append(line)
+            return
+        out.append(line[:_MAX_LINE_OCTETS])
+        step = _MAX_LINE_OCTETS - 1
+        out.extend(" " + line[i:i + step] for i in range(_MAX_LINE_OCTETS, len(line), step))
+        return
+    
+    # Multi-byte text: break on character boundaries, never inside a UTF-8 sequence
+    start = 0
+    size = 0
+    limit = _MAX_LINE_OCTETS
+    for i, ch in enumerate(line):
+        n = len(ch.encode("utf-8"))
+        if size + n > limit:
+            out.append(line[start:i] if start == 0 else " " + line[start:i])
+            start = i
+            size = 0
+            limit = _MAX_LINE_OCTETS - 1
+        size += n
+    out.append(line[start:] if start == 0 else " " + line[start:])
+
 
 class CalendarGenerator:
     """
     Generates ICS calendar files for discharge action plans and follow-ups.
     """
     
+    # (substring, days from today) pairs, checked in order; the first match wins
+    _DAY_OFFSETS = (
+        ("Day 1", 0),
+        ("Today", 0),
+        ("Day 2", 1),
+        # Add a recurring event for the week? Or just a one-time reminder?
+        # For simplicity in this demo, we'll set it for Day 3
+        ("Week 1", 3),
+    )
+    _FOLLOW_UP_OFFSETS = (
+        ("2 weeks", 14),
+        ("1 week", 7),
+        ("month", 30),
+    )
+    
     @staticmethod
     def generate_ics(action_plan: List[Dict[str, Any]], follow_up_schedule: List[Dict[str, Any]]) -> str:
         """
@@ -19,9 +78,30 @@ class CalendarGenerator:
         Returns:
             String content of .ics file
         """
-        events = []
         now = datetime.datetime.now()
         
+        # Offsets repeat across items (many tasks land on Day 1), so each
+        # date string is formatted once, by ordinal arithmetic, not strftime
+        today_ordinal = now.toordinal()
+        uid_prefix = f"{int(now.timestamp())}-{os.getpid()}"
+        date_strs: Dict[int, str] = {}
+        
+        def date_for(offset: int) -> str:
+            date_str = date_strs.get(offset)
+            if date_str is None:
+                d = datetime.date.fromordinal(today_ordinal + offset)
+                date_str = date_strs[offset] = f"{d.year:04d}{d.month:02d}{d.day:02d}"
+            return date_str
+        
+        # Every line of the calendar is appended to one list and joined once
+        out = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//Discharge Simplifier//Healthcare AI//EN",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+        ]
+        
         # 1. Action Plan Events (assuming relative dates starting from "today")
         # Note: This is a simplification. "Day 1" is assumed to be today or tomorrow.
         for item in action_plan:
@@ -30,31 +110,24 @@ class CalendarGenerator:
             meds = item.get('medications', [])
             
             # Determine date offset
-            offset = 0
-            if "Day 1" in day_label or "Today" in day_label:
-                offset = 0
-            elif "Day 2" in day_label:
-                offset = 1
-            elif "Week 1" in day_label:
-                # Add a recurring event for the week? Or just a one-time reminder?
-                # For simplicity in this demo, we'll set it for Day 3
-                offset = 3 
+            offset = next((v for k, v in CalendarGenerator._DAY_OFFSETS if k in day_label), 0)
             
-            event_date = now + datetime.timedelta(days=offset)
-            date_str = event_date.strftime("%Y%m%d")
+            date_str = date_for(offset)
             
             # Create a summary event for the day's tasks
             if tasks or meds:
-                description = "TASKS:\n" + "\n".join([f"- {t}" for t in tasks])
+                # One join with the bullet in the separator, not a format per item
+                description = "TASKS:\n" + ("- " + "\n- ".join(tasks) if tasks else "")
                 if meds:
-                    description += "\n\nMEDICATIONS:\n" + "\n".join([f"- {m}" for m in meds])
+                    description += "\n\nMEDICATIONS:\n- " + "\n- ".join(meds)
                 
-                events.append(CalendarGenerator._create_event_block(
-                    uid=str(uuid.uuid4()),
+                CalendarGenerator._emit_event(
+                    out,
+                    uid=f"{uid_prefix}-{next(_uid_counter)}@discharge-simplifier",
                     start_dt=date_str, # All day event
                     summary=f"Health Plan: {day_label}",
                     description=description
-                ))
+                )
 
         # 2. Follow-Up Appointments
         for appt in follow_up_schedule:
@@ -63,51 +136,37 @@ class CalendarGenerator:
             purpose = appt.get('purpose', '')
             
             # Estimate date for "In 1 week" etc.
-            offset = 7 # Default
-            if "2 weeks" in when:
-                offset = 14
-            elif "1 week" in when:
-                offset = 7
-            elif "month" in when:
-                offset = 30
+            offset = next((v for k, v in CalendarGenerator._FOLLOW_UP_OFFSETS if k in when), 7)
                 
-            appt_date = now + datetime.timedelta(days=offset)
-            date_str = appt_date.strftime("%Y%m%d")
+            date_str = date_for(offset)
             
-            events.append(CalendarGenerator._create_event_block(
-                uid=str(uuid.uuid4()),
+            CalendarGenerator._emit_event(
+                out,
+                uid=f"{uid_prefix}-{next(_uid_counter)}@discharge-simplifier",
                 start_dt=date_str,
                 summary=f"Appt: {specialist}",
                 description=f"When: {when}\nPurpose: {purpose}"
-            ))
+            )
 
-        # Wrap in VCALENDAR
-        ics_content = [
-            "BEGIN:VCALENDAR",
-            "VERSION:2.0",
-            "PRODID:-//Discharge Simplifier//Healthcare AI//EN",
-            "CALSCALE:GREGORIAN",
-            "METHOD:PUBLISH",
-        ]
-        ics_content.extend(events)
-        ics_content.append("END:VCALENDAR")
+        out.append("END:VCALENDAR")
         
-        return "\n".join(ics_content)
+        # RFC 5545 content lines end with CRLF, including the last one
+        return "\r\n".join(out) + "\r\n"
 
     @staticmethod
-    def _create_event_block(uid: str, start_dt: str, summary: str, description: str) -> str:
-        """Helper to create a VEVENT block."""
-        # Simple all-day event
-        # Escape newlines in description
-        safe_desc = description.replace("\n", "\\n")
-        
-        return "\n".join([
+    def _emit_event(out: List[str], uid: str, start_dt: str, summary: str, description: str) -> None:
+        """Helper to append the lines of a VEVENT block to out."""
+        # Simple all-day event. Free-text lines are folded as they are
+        # emitted, so the finished calendar needs no second folding pass
+        out.extend((
             "BEGIN:VEVENT",
             f"UID:{uid}",
             f"DTSTART;VALUE=DATE:{start_dt}",
-            f"SUMMARY:{summary}",
-            f"DESCRIPTION:{safe_desc}",
+        ))
+        _emit_folded(out, f"SUMMARY:{summary.translate(_ICS_ESCAPE)}")
+        _emit_folded(out, f"DESCRIPTION:{description.translate(_ICS_ESCAPE)}")
+        out.extend((
             "STATUS:CONFIRMED",
             "TRANSP:TRANSPARENT",
             "END:VEVENT"
-        ])
+        ))
@@ -0,0 +1,111 @@
+"""
+Approved OTC medication list and local name lookups
+
+Exact generic/brand lookups and rapidfuzz spelling candidates against
+APPROVED_OTC_MEDICATIONS. Kept free of vector store and LLM dependencies so
+OTCMedicationChecker and its tests can use it directly.
+"""
+
+from typing import Any, Dict, List, Optional
+
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+except ImportError:
+    fuzz_process = None
+
+
+# Bump whenever APPROVED_OTC_MEDICATIONS changes so the vector index is rebuilt
+OTC_INDEX_VERSION = 1
+
+# Common OTC medications approved in India (sample list - expand as needed)
+APPROVED_OTC_MEDICATIONS = [
+    {"medicine_name": "Paracetamol", "type": "Analgesic", "common_brands": ["Crocin", "Dolo", "Calpol"]},
+    {"medicine_name": "Ibuprofen", "type": "Analgesic/Anti-inflammatory", "common_brands": ["Brufen", "Advil"]},
+    {"medicine_name": "Aspirin", "type": "Analgesic/Antiplatelet", "common_brands": ["Disprin", "Ecosprin"]},
+    {"medicine_name": "Cetirizine", "type": "Antihistamine", "common_brands": ["Zyrtec", "Alerid"]},
+    {"medicine_name": "Loperamide", "type": "Antidiarrheal", "common_brands": ["Imodium", "Eldoper"]},
+    {"medicine_name": "Omeprazole", "type": "Antacid", "common_brands": ["Omez", "Prilosec"]},
+    {"medicine_name": "Pantoprazole", "type": "Antacid", "common_brands": ["Pan", "Pantocid"]},
+    {"medicine_name": "Ranitidine", "type": "Antacid", "common_brands": ["Aciloc", "Rantac"]},
+    {"medicine_name": "Domperidone", "type": "Antiemetic", "common_brands": ["Domstal", "Vomistop"]},
+    {"medicine_name": "Chlorpheniramine", "type": "Antihistamine", "common_brands": ["Avil", "Piriton"]},
+    {"medicine_name": "Diphenhydramine", "type": "Antihistamine", "common_brands": ["Benadryl"]},
+    {"medicine_name": "Loratadine", "type": "Antihistamine", "common_brands": ["Lorfast", "Claritin"]},
+    {"medicine_name": "Fexofenadine", "type": "Antihistamine", "common_brands": ["Allegra", "Fexo"]},
+    {"medicine_name": "Dextromethorphan", "type": "Cough Suppressant", "common_brands": ["Benadryl DR"]},
+    {"medicine_name": "Guaifenesin", "type": "Expectorant", "common_brands": ["Mucinex"]},
+    {"medicine_name": "Salbutamol", "type": "Bronchodilator", "common_brands": ["Asthalin", "Ventolin"]},
+    {"medicine_name": "Menthol", "type": "Topical Analgesic", "common_brands": ["Vicks", "Moov"]},
+    {"medicine_name": "Diclofenac", "type": "NSAID", "common_brands": ["Voveran", "Voltaren"]},
+    {"medicine_name": "Multivitamins", "type": "Supplement", "common_brands": ["Becosules", "Supradyn"]},
+    {"medicine_name": "Vitamin C", "type": "Supplement", "common_brands": ["Celin", "Limcee"]},
+    {"medicine_name": "Vitamin D", "type": "Supplement", "common_brands": ["D-Rise", "Calcirol"]},
+    {"medicine_name": "Calcium", "type": "Supplement", "common_brands": ["Shelcal", "Calcimax"]},
+    {"medicine_name": "Iron", "type": "Supplement", "common_brands": ["Ferrous Sulfate", "Orofer"]},
+    {"medicine_name": "Zinc", "type": "Supplement", "common_brands": ["Zincovit"]},
+    {"medicine_name": "Oral Rehydration Salts", "type": "Electrolyte", "common_brands": ["Electral", "ORS"]},
+    {"medicine_name": "Activated Charcoal", "type": "Antidote", "common_brands": ["Charcoal Tablets"]},
+    {"medicine_name": "Antacid", "type": "Digestive", "common_brands": ["Digene", "Gelusil", "ENO"]},
+    {"medicine_name": "Lactobacillus", "type": "Probiotic", "common_brands": ["Bifilac", "Econorm"]},
+    {"medicine_name": "Lactulose", "type": "Laxative", "common_brands": ["Duphalac"]},
+    {"medicine_name": "Bisacodyl", "type": "Laxative", "common_brands": ["Dulcolax"]},
+    {"medicine_name": "Povidone-Iodine", "type": "Antiseptic", "common_brands": ["Betadine"]},
+    {"medicine_name": "Hydrogen Peroxide", "type": "Antiseptic", "common_brands": ["H2O2"]},
+    {"medicine_name": "Petroleum Jelly", "type": "Skin Protectant", "common_brands": ["Vaseline"]},
+    {"medicine_name": "Hydrocortisone Cream", "type": "Anti-inflammatory", "common_brands": ["Dermacort"]},
+    {"medicine_name": "Clotrimazole", "type": "Antifungal", "common_brands": ["Candid", "Clotrin"]},
+    {"medicine_name": "Miconazole", "type": "Antifungal", "common_brands": ["Daktarin"]},
+    {"medicine_name": "Glycerin", "type": "Laxative", "common_brands": ["Glycerin Suppositories"]},
+    {"medicine_name": "Sodium Bicarbonate", "type": "Antacid", "common_brands": ["Baking Soda"]},
+]
+
+
+# Lower-cased generic and brand names -> approved entry, for exact lookups
+# that need neither the vector store nor the LLM
+_OTC_LOOKUP: Dict[str, Dict[str, Any]] = {}
+for _med in APPROVED_OTC_MEDICATIONS:
+    for _name in (_med["medicine_name"], *_med.get("common_brands", [])):
+        _OTC_LOOKUP.setdefault(_name.lower(), _med)
+del _med, _name
+_OTC_NAMES = tuple(_OTC_LOOKUP)
+
+# Minimum rapidfuzz similarity (0-100) for a name to be offered to the LLM as
+# a candidate. Close spellings are not proof of the same drug (esomeprazole vs
+# omeprazole), so these are verified like vector search hits
+FUZZY_MATCH_THRESHOLD = 90
+
+
+def lookup_otc(medication_name: str) -> Optional[Dict[str, Any]]:
+    """Return the approved entry whose generic or brand name matches exactly, or None."""
+    return _OTC_LOOKUP.get(medication_name.strip().lower())
+
+
+def fuzzy_otc_candidates(medication_name: str, limit: int = 3) -> List[Dict[str, Any]]:
+    """
+    Approved entries spelled like medication_name, as LLM verification candidates.
+    
+    Returns:
+        Candidate dicts in the same shape as vector search candidates
+    """
+    key = medication_name.strip().lower()
+    if fuzz_process is None or not key:
+        return []
+    
+    candidates = []
+    seen = set()
+    # Plain edit-distance ratio, so a short brand like "Pan" is not offered
+    # for every name that contains it
+    for name, score, _ in fuzz_process.extract(
+        key, _OTC_NAMES, scorer=fuzz.ratio, score_cutoff=FUZZY_MATCH_THRESHOLD, limit=limit
+    ):
+        med = _OTC_LOOKUP[name]
+        if med["medicine_name"] in seen:
+            continue
+        seen.add(med["medicine_name"])
+        candidates.append({
+            "name": med["medicine_name"],
+            "type": med["type"],
+            "brands": ", ".join(med.get("common_brands", [])),
+            "score": score / 100
+        })
+    return candidates
@@ -4,58 +4,46 @@ Integrated from medi.mate project
 Uses vector search + LLM verification to check if medications are safe to buy without prescription
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from pathlib import Path
+import asyncio
+import copy
 import json
+import re
+import threading
+
+from cachetools import TTLCache
 
 from ..config import HealthcareConfig
 from ..utils.logging_utils import setup_logging
 from ..vector_store.vector_store_manager import VectorStoreManager
+from .otc_lookup import (
+    APPROVED_OTC_MEDICATIONS,
+    OTC_INDEX_VERSION,
+    fuzzy_otc_candidates,
+    lookup_otc,
+)
 
 logger = setup_logging(__name__)
 
+# Body of a ```json ... ``` (or bare ```) fenced block in an LLM reply
+_FENCE_RE = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```')
+
+
+def _strip_code_fence(text: str) -> str:
+    """Return the JSON inside a markdown code fence, or the text itself"""
+    match = _FENCE_RE.search(text)
+    return match.group(1) if match else text.strip()
 
-# Common OTC medications approved in India (sample list - expand as needed)
-APPROVED_OTC_MEDICATIONS = [
-    {"medicine_name": "Paracetamol", "type": "Analgesic", "common_brands": ["Crocin", "Dolo", "Calpol"]},
-    {"medicine_name": "Ibuprofen", "type": "Analgesic/Anti-inflammatory", "common_brands": ["Brufen", "Advil"]},
-    {"medicine_name": "Aspirin", "type": "Analgesic/Antiplatelet", "common_brands": ["Disprin", "Ecosprin"]},
-    {"medicine_name": "Cetirizine", "type": "Antihistamine", "common_brands": ["Zyrtec", "Alerid"]},
-    {"medicine_name": "Loperamide", "type": "Antidiarrheal", "common_brands": ["Imodium", "Eldoper"]},
-    {"medicine_name": "Omeprazole", "type": "Antacid", "common_brands": ["Omez", "Prilosec"]},
-    {"medicine_name": "Pantoprazole", "type": "Antacid", "common_brands": ["Pan", "Pantocid"]},
-    {"medicine_name": "Ranitidine", "type": "Antacid", "common_brands": ["Aciloc", "Rantac"]},
-    {"medicine_name": "Domperidone", "type": "Antiemetic", "common_brands": ["Domstal", "Vomistop"]},
-    {"medicine_name": "Chlorpheniramine", "type": "Antihistamine", "common_brands": ["Avil", "Piriton"]},
-    {"medicine_name": "Diphenhydramine", "type": "Antihistamine", "common_brands": ["Benadryl"]},
-    {"medicine_name": "Loratadine", "type": "Antihistamine", "common_brands": ["Lorfast", "Claritin"]},
-    {"medicine_name": "Fexofenadine", "type": "Antihistamine", "common_brands": ["Allegra", "Fexo"]},
-    {"medicine_name": "Dextromethorphan", "type": "Cough Suppressant", "common_brands": ["Benadryl DR"]},
-    {"medicine_name": "Guaifenesin", "type": "Expectorant", "common_brands": ["Mucinex"]},
-    {"medicine_name": "Salbutamol", "type": "Bronchodilator", "common_brands": ["Asthalin", "Ventolin"]},
-    {"medicine_name": "Menthol", "type": "Topical Analgesic", "common_brands": ["Vicks", "Moov"]},
-    {"medicine_name": "Diclofenac", "type": "NSAID", "common_brands": ["Voveran", "Voltaren"]},
-    {"medicine_name": "Multivitamins", "type": "Supplement", "common_brands": ["Becosules", "Supradyn"]},
-    {"medicine_name": "Vitamin C", "type": "Supplement", "common_brands": ["Celin", "Limcee"]},
-    {"medicine_name": "Vitamin D", "type": "Supplement", "common_brands": ["D-Rise", "Calcirol"]},
-    {"medicine_name": "Calcium", "type": "Supplement", "common_brands": ["Shelcal", "Calcimax"]},
-    {"medicine_name": "Iron", "type": "Supplement", "common_brands": ["Ferrous Sulfate", "Orofer"]},
-    {"medicine_name": "Zinc", "type": "Supplement", "common_brands": ["Zincovit"]},
-    {"medicine_name": "Oral Rehydration Salts", "type": "Electrolyte", "common_brands": ["Electral", "ORS"]},
-    {"medicine_name": "Activated Charcoal", "type": "Antidote", "common_brands": ["Charcoal Tablets"]},
-    {"medicine_name": "Antacid", "type": "Digestive", "common_brands": ["Digene", "Gelusil", "ENO"]},
-    {"medicine_name": "Lactobacillus", "type": "Probiotic", "common_brands": ["Bifilac", "Econorm"]},
-    {"medicine_name": "Lactulose", "type": "Laxative", "common_brands": ["Duphalac"]},
-    {"medicine_name": "Bisacodyl", "type": "Laxative", "common_brands": ["Dulcolax"]},
-    {"medicine_name": "Povidone-Iodine", "type": "Antiseptic", "common_brands": ["Betadine"]},
-    {"medicine_name": "Hydrogen Peroxide", "type": "Antiseptic", "common_brands": ["H2O2"]},
-    {"medicine_name": "Petroleum Jelly", "type": "Skin Protectant", "common_brands": ["Vaseline"]},
-    {"medicine_name": "Hydrocortisone Cream", "type": "Anti-inflammatory", "common_brands": ["Dermacort"]},
-    {"medicine_name": "Clotrimazole", "type": "Antifungal", "common_brands": ["Candid", "Clotrin"]},
-    {"medicine_name": "Miconazole", "type": "Antifungal", "common_brands": ["Daktarin"]},
-    {"medicine_name": "Glycerin", "type": "Laxative", "common_brands": ["Glycerin Suppositories"]},
-    {"medicine_name": "Sodium Bicarbonate", "type": "Antacid", "common_brands": ["Baking Soda"]},
-]
+
+# Classified results keyed by (normalized name, normalized dosage). The same
+# drug often appears on several prescriptions in one discharge summary
+_otc_result_cache: TTLCache = TTLCache(maxsize=4096, ttl=3600)
+_otc_result_cache_lock = threading.Lock()
+
+# Concurrent checks per batch; each check is a vector search plus LLM call(s)
+BATCH_CONCURRENCY = 6
 
 
 class OTCMedicationChecker:
@@ -101,6 +89,10 @@ class OTCMedicationChecker:
         Ingest OTC medication list into vector store for fast semantic search.
         """
         try:
+            if self._is_otc_indexed():
+                logger.info(f"OTC medication index v{OTC_INDEX_VERSION} already present, skipping ingestion")
+                return
+            
             logger.info("Initializing OTC medication database...")
             
             # Prepare documents for ingestion
@@ -117,13 +109,12 @@ class OTCMedicationChecker:
                     "medicine_name": med["medicine_name"],
                     "type": med["type"],
                     "brands": brands_text,
-                    "source": "approved_otc_list"
+                    "source": "approved_otc_list",
+                    "otc_version": OTC_INDEX_VERSION
                 })
             
             # Add to vector store with specific namespace
             if self.vector_store:
-                # Check if already indexed (optional - for efficiency)
-                # For now, we'll upsert every time (idempotent)
                 self.vector_store.add_documents(
                     documents=documents,
                     metadatas=metadatas,
@@ -134,6 +125,33 @@ class OTCMedicationChecker:
         except Exception as e:
             logger.error(f"Failed to initialize OTC database: {e}")
     
+    def _is_otc_indexed(self) -> bool:
+        """
+        Check whether the current OTC list version is already in the vector store.
+        
+        A single probe query replaces re-embedding and upserting the whole
+        list every time a checker is created.
+        """
+        if not self.vector_store:
+            return False
+        
+        try:
+            matches = self.vector_store.search(
+                query=APPROVED_OTC_MEDICATIONS[0]["medicine_name"],
+                namespace=self.otc_namespace,
+                top_k=1
+            )
+        except Exception as e:
+            logger.warning(f"Could not probe OTC index, re-indexing: {e}")
+            return False
+        
+        for match in matches or []:
+            metadata = match.get("metadata") or {}
+            if (metadata.get("source") == "approved_otc_list"
+                    and metadata.get("otc_version") == OTC_INDEX_VERSION):
+                return True
+        return False
+    
     def check_medication(self, medication_name: str, dosage: Optional[str] = None) -> Dict[str, Any]:
         """
         Check if a single medication is OTC or requires prescription.
@@ -153,6 +171,38 @@ class OTCMedicationChecker:
                 "alternatives": ["Alternative OTC options if prescription required"]
             }
         """
+        key = (medication_name.strip().lower(), (dosage or "").strip().lower())
+        with _otc_result_cache_lock:
+            cached = _otc_result_cache.get(key)
+        if cached is not None:
+            result = copy.deepcopy(cached)
+            result["medication"] = medication_name
+            return result
+        
+        result = self._check_medication(medication_name, dosage)
+        
+        # UNKNOWN means initialization or the LLM failed; retry those next time
+        if result["status"] != "UNKNOWN":
+            with _otc_result_cache_lock:
+                _otc_result_cache[key] = copy.deepcopy(result)
+        return result
+    
+    def _check_medication(self, medication_name: str, dosage: Optional[str] = None) -> Dict[str, Any]:
+        """Classify one medication without consulting the result cache."""
+        # Step 0: Exact names on the approved list resolve locally. With a
+        # dosage the LLM still decides, since high strengths may need a prescription
+        if not dosage:
+            entry = lookup_otc(medication_name)
+            if entry is not None:
+                return {
+                    "medication": medication_name,
+                    "status": "OTC",
+                    "confidence": 1.0,
+                    "matched_otc": entry["medicine_name"],
+                    "reason": f"{entry['medicine_name']} ({entry['type']}) is on the approved OTC list",
+                    "alternatives": []
+                }
+        
         if not self.vector_store or not self.llm:
             return {
                 "medication": medication_name,
@@ -170,12 +220,9 @@ class OTCMedicationChecker:
                 top_k=5
             )
             
-            if not matches or len(matches) == 0:
-                return self._check_with_llm_only(medication_name, dosage)
-            
-            # Step 2: Get top candidates
+            # Step 2: Get top candidates, plus close spellings of approved names
             candidates = []
-            for match in matches:
+            for match in matches or []:
                 if match.get("score", 0) > 0.7:  # High similarity threshold
                     candidates.append({
                         "name": match["metadata"]["medicine_name"],
@@ -184,6 +231,12 @@ class OTCMedicationChecker:
                         "score": match.get("score", 0)
                     })
             
+            candidate_names = {c["name"] for c in candidates}
+            candidates.extend(
+                c for c in fuzzy_otc_candidates(medication_name)
+                if c["name"] not in candidate_names
+            )
+            
             if not candidates:
                 return self._check_with_llm_only(medication_name, dosage)
             
@@ -220,12 +273,7 @@ Respond in JSON:
             result_text = response.content
             
             # Parse JSON response
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0]
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0]
-            
-            llm_result = json.loads(result_text.strip())
+            llm_result = json.loads(_strip_code_fence(result_text))
             
             # Format final result
             status = "OTC" if llm_result.get("is_otc") else "PRESCRIPTION_REQUIRED"
@@ -263,6 +311,45 @@ Respond in JSON:
                 "unknown": [List of medications that couldn't be classified]
             }
         """
+        # Distinct names are checked concurrently, each once per request
+        distinct = list(dict.fromkeys(medications))
+        if len(distinct) <= 1:
+            checked = {med: self.check_medication(med) for med in distinct}
+        else:
+            with ThreadPoolExecutor(max_workers=min(BATCH_CONCURRENCY, len(distinct))) as executor:
+                checked = dict(zip(distinct, executor.map(self.check_medication, distinct)))
+        
+        return self._group_results(medications, checked)
+    
+    async def acheck_medication(self, medication_name: str, dosage: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Async variant of check_medication.
+        
+        The check runs in a worker thread so the event loop is not blocked
+        by the vector search and LLM round-trips.
+        """
+        return await asyncio.to_thread(self.check_medication, medication_name, dosage)
+    
+    async def acheck_medications_batch(self, medications: List[str]) -> Dict[str, Any]:
+        """
+        Async variant of check_medications_batch.
+        
+        Distinct medications are checked concurrently, at most
+        BATCH_CONCURRENCY at a time.
+        """
+        distinct = list(dict.fromkeys(medications))
+        sem = asyncio.Semaphore(BATCH_CONCURRENCY)
+        
+        async def _check(med: str) -> Dict[str, Any]:
+            async with sem:
+                return await self.acheck_medication(med)
+        
+        results = await asyncio.gather(*[_check(med) for med in distinct])
+        return self._group_results(medications, dict(zip(distinct, results)))
+    
+    @staticmethod
+    def _group_results(medications: List[str], checked: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Sort per-medication results into OTC/prescription/unknown, in input order."""
         results = {
             "otc_safe": [],
             "prescription_required": [],
@@ -270,7 +357,7 @@ Respond in JSON:
         }
         
         for med in medications:
-            check_result = self.check_medication(med)
+            check_result = checked[med]
             
             if check_result["status"] == "OTC":
                 results["otc_safe"].append(check_result)
@@ -304,12 +391,7 @@ Respond in JSON:
             response = self.llm.invoke(prompt)
             result_text = response.content
             
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0]
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0]
-            
-            llm_result = json.loads(result_text.strip())
+            llm_result = json.loads(_strip_code_fence(result_text))
             
             return {
                 "medication": medication_name,
@@ -354,6 +436,24 @@ Return only the medication names, one per line."""
         return APPROVED_OTC_MEDICATIONS
 
 
+# Process-wide checker, so callers share one vector store client and LLM
+_otc_checker: Optional[OTCMedicationChecker] = None
+
+
+def get_otc_checker() -> OTCMedicationChecker:
+    """
+    Return the shared OTCMedicationChecker, creating it on first use.
+    
+    A checker whose initialization failed is replaced on the next call
+    rather than cached.
+    """
+    global _otc_checker
+    
+    if _otc_checker is None or not _otc_checker.vector_store or not _otc_checker.llm:
+        _otc_checker = OTCMedicationChecker()
+    return _otc_checker
+
+
 # Utility function for quick checks
 def is_medication_otc(medication_name: str) -> bool:
     """
@@ -365,6 +465,5 @@ def is_medication_otc(medication_name: str) -> bool:
     Returns:
         True if OTC, False if prescription required or unknown
     """
-    checker = OTCMedicationChecker()
-    result = checker.check_medication(medication_name)
+    result = get_otc_checker().check_medication(medication_name)
     return result["status"] == "OTC"
@@ -155,12 +155,15 @@ class CloudVectorStore:
         from qdrant_client.models import PointStruct
         import uuid
         
+        # Batch embed all documents at once instead of one request per document
+        texts = [doc.page_content for doc in documents]
+        embeddings = self.embedding_manager.embed_documents(texts, show_progress=True)
+        
         ids = []
         points = []
         
-        for doc in documents:
+        for doc, embedding in zip(documents, embeddings):
             doc_id = str(uuid.uuid4())
-            embedding = self.embedding_manager.embed_query(doc.page_content)
             
             points.append(PointStruct(
                 id=doc_id,
@@ -7,10 +7,13 @@ Agent Lightning Integration:
 """
 
 import asyncio
-from typing import Dict, Any, Optional
+import io
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from pathlib import Path
 from .config import HealthcareConfig
 from .chains.base_chains import SafetyGuardrailChain
+from .security.pii import detect_pii
 from .chains.specialized_chains import DischargeSimplifierChain, PatientEducationChain
 from .schemas import DischargeOutputSchema
 from .document_processor.discharge_loader import DischargeLoader
@@ -27,6 +30,36 @@ except (ImportError, ModuleNotFoundError) as e:
     # Don't print warning during normal import - only when explicitly trying to use it
     _AGENT_LIGHTNING_IMPORT_ERROR = str(e)
 
+# Discharge text normalization: curly quotes / non-breaking spaces to ASCII in
+# one str.translate pass, then collapse runs of spaces and tabs (newlines are
+# kept since section layout matters to the simplifier).
+_NORMALIZE_TABLE = str.maketrans({
+    "\u2018": "'",
+    "\u2019": "'",
+    "\u201c": '"',
+    "\u201d": '"',
+    "\xa0": " ",
+})
+_HORIZONTAL_WS_RE = re.compile(r"[ \t]+")
+
+# Case-insensitive scans so neither chat input nor words need a lowercased copy
+_EDUCATION_INTENT_RE = re.compile(
+    "video|youtube|exercise|rehab|recovery|workout|physio", re.IGNORECASE
+)
+_VOWEL_GROUP_RE = re.compile(r"[aeiouy]+", re.IGNORECASE)
+
+
+def _discard_task_result(task: "asyncio.Task") -> None:
+    """Retrieve an abandoned task's outcome so its exception is not logged as unhandled."""
+    if not task.cancelled():
+        task.exception()
+
+
+def _abandon_task(task: "asyncio.Task") -> None:
+    """Cancel a task whose result is no longer wanted, so its LLM call stops early."""
+    task.cancel()
+    task.add_done_callback(_discard_task_result)
+
 
 class DischargeWorkflow:
     """
@@ -76,6 +109,55 @@ class DischargeWorkflow:
             user_location: (latitude, longitude) tuple for location-based responses
             response_language: Target language for response
         """
+        messages, intent, video_resources = await self._prepare_chat(
+            user_input, user_profile, conversation_history, response_language
+        )
+        
+        response = await self.config.llm_primary.ainvoke(messages)
+        output_text = response.content + self._format_video_resources(video_resources)
+        
+        return {
+            "output": output_text,
+            "intent": intent,
+            "confidence": 1.0,
+            "sources": [],
+            "nearby_hospitals": None, 
+            "profile_updated": False
+        }
+
+    async def run_stream(
+        self,
+        user_input: str,
+        user_profile: dict = None,
+        conversation_history: list = None,
+        response_language: str = "en"
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of run(): yields the reply text as the LLM produces it.
+        
+        Time-to-first-token replaces full generation time as the latency the
+        user sees. Video recommendations, if any, are yielded after the reply.
+        """
+        messages, _intent, video_resources = await self._prepare_chat(
+            user_input, user_profile, conversation_history, response_language
+        )
+        
+        async for chunk in self.config.llm_primary.astream(messages):
+            if chunk.content:
+                yield chunk.content
+        
+        videos = self._format_video_resources(video_resources)
+        if videos:
+            yield videos
+
+    async def _prepare_chat(
+        self,
+        user_input: str,
+        user_profile: Optional[dict],
+        conversation_history: Optional[list],
+        response_language: str
+    ) -> Tuple[list, str, Optional[Dict[str, Any]]]:
+        """Build the chat messages; returns (messages, intent, video_resources)."""
         print(f"\n💬 Chat Request: {user_input}")
         print(f"📚 Conversation History: {len(conversation_history) if conversation_history else 0} messages")
         if user_profile:
@@ -92,8 +174,7 @@ class DischargeWorkflow:
         video_resources = None
         
         # Simple keyword detection for education/video intent
-        keywords = ["video", "youtube", "exercise", "rehab", "recovery", "workout", "physio"]
-        if any(k in user_input.lower() for k in keywords):
+        if _EDUCATION_INTENT_RE.search(user_input):
             print("   → Detected Patient Education/Video intent")
             intent = "patient_education"
             try:
@@ -105,17 +186,21 @@ class DischargeWorkflow:
         # Build messages with conversation history for context
         
         # Extract user profile context (includes prescriptions, lab reports, etc.)
+        # document_context can be many KB, so the pieces are written into one
+        # buffer instead of re-copying the growing string on every +=
         profile_info = ""
         if user_profile:
-            profile_info = f"\n\n=== User Medical Context ===\n"
+            buf = io.StringIO()
+            buf.write("\n\n=== User Medical Context ===\n")
             if user_profile.get("age"):
-                profile_info += f"Age: {user_profile.get('age')}\n"
+                buf.write(f"Age: {user_profile.get('age')}\n")
             if user_profile.get("gender"):
-                profile_info += f"Gender: {user_profile.get('gender')}\n"
+                buf.write(f"Gender: {user_profile.get('gender')}\n")
             
             # Add all uploaded medical documents (prescriptions, lab reports, discharge summaries)
             if user_profile.get("document_context"):
-                profile_info += user_profile.get("document_context")
+                buf.write(user_profile.get("document_context"))
+            profile_info = buf.getvalue()
         
         messages = [
             ("system", f"""You are Swastha, a helpful healthcare assistant. You help users with discharge instructions, recovery advice, and general health queries.
@@ -162,28 +247,25 @@ You cannot:
         # Add current user input
         messages.append(("user", user_input))
         
-        response = await self.config.llm_primary.ainvoke(messages)
-        output_text = response.content
-        
-        # Append video recommendations to text if found
-        if video_resources and video_resources.get("search_queries"):
-            output_text += "\n\n**Recommended Recovery Videos (YouTube):**\n"
-            for q in video_resources["search_queries"]:
-                output_text += f"- [{q}](https://www.youtube.com/results?search_query={q.replace(' ', '+')})\n"
-            
-            if video_resources.get("recovery_tips"):
-                 output_text += "\n**Quick Recovery Tips:**\n"
-                 for tip in video_resources["recovery_tips"]:
-                     output_text += f"- {tip}\n"
-        
-        return {
-            "output": output_text,
-            "intent": intent,
-            "confidence": 1.0,
-            "sources": [],
-            "nearby_hospitals": None, 
-            "profile_updated": False
-        }
+        return messages, intent, video_resources
+
+    @staticmethod
+    def _format_video_resources(video_resources: Optional[Dict[str, Any]]) -> str:
+        """Markdown block of recommended videos and tips ("" if none)."""
+        if not video_resources or not video_resources.get("search_queries"):
+            return ""
+        
+        parts = ["\n\n**Recommended Recovery Videos (YouTube):**\n"]
+        parts.extend(
+            f"- [{q}](https://www.youtube.com/results?search_query={q.replace(' ', '+')})\n"
+            for q in video_resources["search_queries"]
+        )
+        
+        if video_resources.get("recovery_tips"):
+            parts.append("\n**Quick Recovery Tips:**\n")
+            parts.extend(f"- {tip}\n" for tip in video_resources["recovery_tips"])
+        
+        return "".join(parts)
 
     async def process_file(self, file_path: str) -> Dict[str, Any]:
         """
@@ -199,6 +281,18 @@ You cannot:
         if not text:
             return {"error": "Could not extract text from file", "status": "failed"}
             
+        return await self.process_text(text)
+
+    async def process_text(self, text: str) -> Dict[str, Any]:
+        """
+        Process discharge text that is already in memory.
+        
+        Prefer this over writing the text to a file for process_file.
+        """
+        if not text or not text.strip():
+            return {"error": "No discharge text provided", "status": "failed"}
+        
+        text = _HORIZONTAL_WS_RE.sub(" ", text.translate(_NORMALIZE_TABLE))
         return await self.process_with_evaluation(text)
 
     async def process_discharge_document(self, text: str, skip_safety_check: bool = False) -> Dict[str, Any]:
@@ -214,13 +308,36 @@ You cannot:
         """
         print(f"\n📄 Processing discharge document ({len(text)} chars)...")
         
+        # Structured PII is rejected locally, before any of the document
+        # leaves the process
+        if not skip_safety_check:
+            pii = detect_pii(text)
+            if pii:
+                reason = f"PII detected (regex): {pii}"
+                print(f"   ❌ Safety check failed: {reason}")
+                return {
+                    "error": "Safety check failed",
+                    "reason": reason,
+                    "status": "blocked"
+                }
+        
+        # The LLM safety check and the simplification are independent calls,
+        # so both are started at once; the simplification is cancelled if the
+        # document turns out to be unsafe
+        simplify_task = asyncio.create_task(self.discharge_chain.arun(text))
+        
         # Step 1: Safety check (optional)
         if not skip_safety_check:
             print("🛡️ [STEP 1] Safety check...")
-            safety_result = await asyncio.to_thread(self.safety_chain.check, text)
+            try:
+                safety_result = await asyncio.to_thread(self.safety_chain.check, text)
+            except BaseException:
+                _abandon_task(simplify_task)
+                raise
             
             if not safety_result.get("is_safe", True):
                 print(f"   ❌ Safety check failed: {safety_result.get('reason')}")
+                _abandon_task(simplify_task)
                 return {
                     "error": "Safety check failed",
                     "reason": safety_result.get("reason"),
@@ -231,13 +348,10 @@ You cannot:
         # Step 2: Simplify discharge instructions
         print("📋 [STEP 2] Simplifying discharge instructions...")
         try:
-            result_schema: DischargeOutputSchema = await asyncio.to_thread(
-                self.discharge_chain.run, 
-                text
-            )
+            result_schema: DischargeOutputSchema = await simplify_task
             
             # Convert Pydantic model to dict
-            result_dict = result_schema.dict()
+            result_dict = result_schema.model_dump()
             result_dict["status"] = "success"
             
             # Step 2a: Generate Calendar File (ICS)
@@ -303,7 +417,26 @@ You cannot:
             print(f"   📊 Agent Lightning reward emitted: {reward:.3f}")
         
         return result
-    
+
+    async def process_batch(self, texts: List[str], max_concurrency: int = 4) -> List[Dict[str, Any]]:
+        """
+        Process several discharge documents concurrently.
+
+        Each document goes through process_text; at most
+        max_concurrency of them are in flight at once so LLM calls overlap
+        without tripping rate limits.
+
+        Returns:
+            List of result dictionaries, in the same order as texts
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _process_one(text: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.process_text(text)
+
+        return await asyncio.gather(*(_process_one(text) for text in texts))
+
     def _calculate_training_reward(self, evaluation: Dict[str, Any]) -> float:
         """
         Calculate a training reward [0, 1] from evaluation metrics.
@@ -357,19 +490,10 @@ You cannot:
 
     def _count_syllables(self, word: str) -> int:
         """Approximate syllable count"""
-        word = word.lower()
-        vowels = 'aeiouy'
-        count = 0
-        prev_was_vowel = False
-        
-        for char in word:
-            is_vowel = char in vowels
-            if is_vowel and not prev_was_vowel:
-                count += 1
-            prev_was_vowel = is_vowel
+        count = len(_VOWEL_GROUP_RE.findall(word))
         
         # Adjust for silent e
-        if word.endswith('e'):
+        if word.endswith(('e', 'E')):
             count -= 1
         
         return max(1, count)
@@ -390,10 +514,12 @@ You cannot:
         if not action_plan:
             return {"usable": False, "reason": "No action plan"}
         
-        total_tasks = sum(len(day.get("tasks", [])) for day in action_plan)
-        has_specific_times = any("AM" in str(task) or "PM" in str(task) or ":" in str(task) 
-                                 for day in action_plan 
-                                 for task in day.get("tasks", []))
+        # Look up each day's tasks (and stringify each task) once
+        tasks_per_day = [day.get("tasks", []) for day in action_plan]
+        total_tasks = sum(map(len, tasks_per_day))
+        has_specific_times = any("AM" in text or "PM" in text or ":" in text
+                                 for tasks in tasks_per_day
+                                 for text in map(str, tasks))
         
         return {
             "usable": total_tasks > 0,
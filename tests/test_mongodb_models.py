@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("bson")
+
+from pydantic import TypeAdapter, ValidationError
+
+from src.database.mongodb_models import StringList
+
+_string_list = TypeAdapter(StringList)
+
+
+@pytest.mark.parametrize("stored, expected", [
+    # Native BSON array
+    (["Diabetes", "Asthma"], ["Diabetes", "Asthma"]),
+    # JSON-encoded list
+    ('["Diabetes", "Asthma"]', ["Diabetes", "Asthma"]),
+    ("[]", []),
+    # Comma-separated text
+    ("Diabetes, Asthma", ["Diabetes", "Asthma"]),
+    # Plain single value
+    ("Penicillin", ["Penicillin"]),
+    # JSON-encoded scalars
+    ('"Penicillin"', ["Penicillin"]),
+    ("42", ["42"]),
+    # Empty string
+    ("", []),
+    ("   ", []),
+])
+def test_legacy_string_list_formats(stored, expected):
+    assert _string_list.validate_python(stored) == expected
+
+
+@pytest.mark.parametrize("stored", ["null", '{"name": "Penicillin"}'])
+def test_uninterpretable_values_raise(stored):
+    with pytest.raises(ValidationError):
+        _string_list.validate_python(stored)
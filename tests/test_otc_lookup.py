@@ -0,0 +1,22 @@
+import pytest
+
+from src.utils.otc_lookup import fuzzy_otc_candidates, lookup_otc
+
+
+@pytest.mark.parametrize("name", ["Crocin", " paracetamol ", "DOLO", "Pan"])
+def test_exact_names_resolve_locally(name):
+    assert lookup_otc(name) is not None
+
+
+@pytest.mark.parametrize("name", ["Esomeprazole", "Calcitriol", "Desloratadine", "Paracetmol"])
+def test_close_spellings_do_not_resolve_locally(name):
+    # Different (prescription) drugs spelled like approved ones must go to
+    # LLM verification, never straight to OTC
+    assert lookup_otc(name) is None
+
+
+def test_close_spellings_are_offered_as_candidates():
+    pytest.importorskip("rapidfuzz")
+    candidates = fuzzy_otc_candidates("Esomeprazole")
+    assert [c["name"] for c in candidates] == ["Omeprazole"]
+    assert set(candidates[0]) == {"name", "type", "brands", "score"}
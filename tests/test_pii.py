@@ -0,0 +1,44 @@
+import pytest
+
+from src.security.pii import detect_pii, find_pii, luhn_valid, verhoeff_valid
+
+
+@pytest.mark.parametrize("text", [
+    # Lab values one per line: digit groups split by newlines, not spaces
+    "Labs:\n1200\n1340\n1500",
+    # Date and time that happen to form three groups of four
+    "Follow up on 2024 1115 1200 hrs",
+    # Aadhaar-shaped but starting with 0/1, or failing the Verhoeff check
+    "Ref 1234 5678 9012",
+    "Ref 2341 2341 2345",
+    # Runs of vitals and grouped digits that are not valid card numbers
+    "Glucose 110 112 108 115 120 118",
+    "Counts 1200 1340 1500 1601",
+    # Hospital identifiers
+    "Inpatient IP1234567, bed 12",
+    # Never-issued SSN ranges
+    "Code 000-12-3456",
+])
+def test_clinical_text_is_not_pii(text):
+    assert find_pii(text) == []
+    assert detect_pii(text) is None
+
+
+@pytest.mark.parametrize("text, kind", [
+    ("Aadhaar 2341 2341 2346", "aadhaar"),
+    ("Card 4111 1111 1111 1111", "credit_card"),
+    ("Card 4111-1111-1111-1111", "credit_card"),
+    ("Card 4111111111111111", "credit_card"),
+    ("Amex 3782 822463 10005", "credit_card"),
+    ("SSN 123-45-6789", "ssn"),
+])
+def test_valid_identifiers_are_pii(text, kind):
+    assert find_pii(text) == [kind]
+    assert detect_pii(text) is not None
+
+
+def test_checksums():
+    assert luhn_valid("4111111111111111")
+    assert not luhn_valid("4111111111111112")
+    assert verhoeff_valid("234123412346")
+    assert not verhoeff_valid("234123412345")
@@ -1,9 +1,9 @@
 import asyncio
-import os
 import sys
+from pathlib import Path
 
-# Add src to path
-sys.path.append(os.path.join(os.getcwd()))
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from src.config import HealthcareConfig
 from src.workflow import HealthcareWorkflow
@@ -21,8 +21,9 @@ import os
 import sys
 from pathlib import Path
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent))
+# Add project root to path (resolved once, independent of the CWD)
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
 
 # CRITICAL: Install Unix stub modules for Windows compatibility BEFORE importing agentlightning
 if sys.platform == 'win32':
@@ -71,12 +72,13 @@ from src.agent_lightning.prompt_templates import (
 from src.agent_lightning.rollouts import (
     discharge_simplifier_rollout,
     patient_education_rollout,
-    discharge_workflow_rollout,
+    discharge_workflow_rollout_async,
 )
 from src.agent_lightning.datasets import (
     load_discharge_dataset,
     load_education_dataset,
 )
+from src.agent_lightning.reporting import ReportBuffer
 
 
 def parse_args():
@@ -151,14 +153,14 @@ def main():
     """Main training function."""
     args = parse_args()
     
-    print("=" * 80)
-    print("AGENT LIGHTNING - APO TRAINING")
-    print("=" * 80)
-    print(f"\nMode: {'DRY RUN' if args.dry_run else 'FULL TRAINING'}")
-    print(f"Agent: {args.agent}")
-    print(f"Beam Rounds: {args.beam_rounds}")
-    print(f"N Runners: {args.n_runners}")
-    print()
+    report = ReportBuffer()
+    report.banner("AGENT LIGHTNING - APO TRAINING")
+    report.line(f"\nMode: {'DRY RUN' if args.dry_run else 'FULL TRAINING'}")
+    report.line(f"Agent: {args.agent}")
+    report.line(f"Beam Rounds: {args.beam_rounds}")
+    report.line(f"N Runners: {args.n_runners}")
+    report.line()
+    report.flush()
     
     # Verify API key
     api_key = os.getenv("OPENAI_API_KEY_1") or os.getenv("OPENAI_API_KEY")
@@ -169,7 +171,7 @@ def main():
     print("✓ OpenAI API key found")
     
     # Create configuration
-    config = AgentLightningConfig(
+    config = AgentLightningConfig.create(
         beam_rounds=args.beam_rounds,
         beam_width=args.beam_width,
         n_runners=args.n_runners,
@@ -190,7 +192,7 @@ def main():
         print(f"✓ Loaded {len(train_data)} train / {len(val_data)} val education samples")
         
     elif args.agent == "workflow":
-        rollout_fn = discharge_workflow_rollout
+        rollout_fn = discharge_workflow_rollout_async
         initial_prompt = DISCHARGE_SIMPLIFIER_PROMPT
         train_data, val_data = load_discharge_dataset()
         print(f"✓ Loaded {len(train_data)} train / {len(val_data)} val workflow samples")
@@ -209,9 +211,10 @@ def main():
     trainer = create_trainer(config, algorithm, initial_resources)
     
     # Run training
-    print("\n" + "=" * 80)
-    print("STARTING TRAINING")
-    print("=" * 80 + "\n")
+    report.line()
+    report.banner("STARTING TRAINING")
+    report.line()
+    report.flush()
     
     if args.dry_run:
         # Use dev mode for dry run
@@ -232,9 +235,9 @@ def main():
         except ValueError as e:
             print(f"\n⚠️ Could not retrieve best prompt: {e}")
     
-    print("\n" + "=" * 80)
-    print("TRAINING COMPLETE")
-    print("=" * 80)
+    report.line()
+    report.banner("TRAINING COMPLETE")
+    report.flush()
 
 
 if __name__ == "__main__":
@@ -23,12 +23,14 @@ import argparse
 import os
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
 from dataclasses import dataclass
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent))
+# Add project root to path (resolved once, independent of the CWD)
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT))
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -45,6 +47,9 @@ from src.agent_lightning.datasets import (
     load_discharge_dataset,
     load_education_dataset,
 )
+from src.agent_lightning.llm_cache import cached_chat_completion, parse_json_response
+from src.agent_lightning.reporting import ReportBuffer
+from src.agent_lightning.schemas import DISCHARGE_RESPONSE_FORMAT
 
 
 # =============================================================================
@@ -101,6 +106,7 @@ class APOConfig:
     temperature_gradient: float = 0.7  # For generating prompt improvements
     temperature_apply: float = 0.3     # For applying changes
     model: str = "gpt-4o-mini"
+    max_workers: int = 4               # Concurrent agent calls per evaluation
 
 
 def run_agent(client: OpenAI, prompt_template: str, input_text: str) -> Dict[str, Any]:
@@ -108,7 +114,8 @@ def run_agent(client: OpenAI, prompt_template: str, input_text: str) -> Dict[str
     prompt = prompt_template.replace("{input_text}", input_text)
     
     try:
-        response = client.chat.completions.create(
+        result_text = cached_chat_completion(
+            client,
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You must respond with valid JSON only."},
@@ -116,9 +123,9 @@ def run_agent(client: OpenAI, prompt_template: str, input_text: str) -> Dict[str
             ],
             temperature=0.3,
             max_tokens=2000,
-            response_format={"type": "json_object"}
+            response_format=DISCHARGE_RESPONSE_FORMAT
         )
-        result = json.loads(response.choices[0].message.content)
+        result = parse_json_response(result_text)
         result["status"] = "success"
         return result
     except Exception as e:
@@ -126,14 +133,25 @@ def run_agent(client: OpenAI, prompt_template: str, input_text: str) -> Dict[str
 
 
 def evaluate_prompt(client: OpenAI, prompt_template: str, 
-                    samples: List[Dict], grader_fn) -> Tuple[float, List[Dict]]:
-    """Evaluate a prompt template on samples."""
+                    samples: List[Dict], grader_fn,
+                    max_workers: int = 4) -> Tuple[float, List[Dict]]:
+    """
+    Evaluate a prompt template on samples.
+    
+    Agent calls for all samples are issued concurrently (up to max_workers)
+    so their network round-trips overlap; grading runs once outputs are in.
+    """
     results = []
     total_reward = 0.0
     
-    for sample in samples:
-        input_text = sample.get("document_text") or sample.get("context") or sample.get("text", "")
-        output = run_agent(client, prompt_template, input_text)
+    inputs = [
+        sample.get("document_text") or sample.get("context") or sample.get("text", "")
+        for sample in samples
+    ]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        outputs = list(pool.map(lambda text: run_agent(client, prompt_template, text), inputs))
+    
+    for input_text, output in zip(inputs, outputs):
         reward = grader_fn(output)
         
         results.append({
@@ -216,13 +234,13 @@ Output ONLY the improved prompt, nothing else."""
 def train_apo_windows(agent_type: str, config: APOConfig, dry_run: bool = False):
     """Main APO training loop for Windows."""
     
-    print("=" * 80)
-    print("WINDOWS-COMPATIBLE APO TRAINING")
-    print("=" * 80)
-    print(f"\nAgent: {agent_type}")
-    print(f"Optimization Rounds: {config.optimization_rounds}")
-    print(f"Samples per Round: {config.samples_per_round}")
-    print()
+    report = ReportBuffer()
+    report.banner("WINDOWS-COMPATIBLE APO TRAINING")
+    report.line(f"\nAgent: {agent_type}")
+    report.line(f"Optimization Rounds: {config.optimization_rounds}")
+    report.line(f"Samples per Round: {config.samples_per_round}")
+    report.line()
+    report.flush()
     
     # Initialize OpenAI client
     api_key = os.getenv("OPENAI_API_KEY_1") or os.getenv("OPENAI_API_KEY")
@@ -254,25 +272,28 @@ def train_apo_windows(agent_type: str, config: APOConfig, dry_run: bool = False)
     best_reward = 0.0
     
     for round_num in range(config.optimization_rounds):
-        print(f"\n{'=' * 60}")
-        print(f"ROUND {round_num + 1}/{config.optimization_rounds}")
-        print("=" * 60)
+        report.line()
+        report.banner(f"ROUND {round_num + 1}/{config.optimization_rounds}", width=60)
+        report.flush()
         
         # Select samples for this round
         samples = train_data[:config.samples_per_round]
         
         # Evaluate current prompt
         print("\n📊 Evaluating current prompt...")
-        avg_reward, results = evaluate_prompt(client, current_prompt, samples, grader_fn)
-        print(f"   Average reward: {avg_reward:.3f}")
+        avg_reward, results = evaluate_prompt(
+            client, current_prompt, samples, grader_fn, config.max_workers
+        )
+        report.line(f"   Average reward: {avg_reward:.3f}")
         
         for i, r in enumerate(results):
-            print(f"   Sample {i+1}: reward={r['reward']:.3f} status={r['output_status']}")
+            report.line(f"   Sample {i+1}: reward={r['reward']:.3f} status={r['output_status']}")
         
         if avg_reward > best_reward:
             best_reward = avg_reward
             best_prompt = current_prompt
-            print(f"   🏆 New best reward: {best_reward:.3f}")
+            report.line(f"   🏆 New best reward: {best_reward:.3f}")
+        report.flush()
         
         # Generate improvement gradient
         print("\n🔍 Generating improvement suggestions...")
@@ -285,7 +306,9 @@ def train_apo_windows(agent_type: str, config: APOConfig, dry_run: bool = False)
         
         # Evaluate improved prompt
         print("\n📊 Evaluating improved prompt...")
-        new_reward, new_results = evaluate_prompt(client, improved_prompt, samples, grader_fn)
+        new_reward, new_results = evaluate_prompt(
+            client, improved_prompt, samples, grader_fn, config.max_workers
+        )
         print(f"   New average reward: {new_reward:.3f}")
         
         if new_reward > avg_reward:
@@ -301,11 +324,11 @@ def train_apo_windows(agent_type: str, config: APOConfig, dry_run: bool = False)
     output_file = output_dir / f"{agent_type}_optimized_prompt.txt"
     output_file.write_text(best_prompt, encoding="utf-8")
     
-    print(f"\n{'=' * 80}")
-    print("TRAINING COMPLETE")
-    print("=" * 80)
-    print(f"\n✅ Best reward achieved: {best_reward:.3f}")
-    print(f"✅ Optimized prompt saved to: {output_file}")
+    report.line()
+    report.banner("TRAINING COMPLETE")
+    report.line(f"\n✅ Best reward achieved: {best_reward:.3f}")
+    report.line(f"✅ Optimized prompt saved to: {output_file}")
+    report.flush()
 
 
 def main():